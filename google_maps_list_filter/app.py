@@ -1,26 +1,40 @@
 import os
+import copy
+import mmap
+import shutil
 import tempfile
-import hashlib
-import json
-import io
-import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from tqdm.auto import tqdm
 
 import streamlit as st
 import folium
-import googlemaps
+import numpy as np
+import openai
+import orjson
+import pandas as pd
+from blake3 import blake3
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from loguru import logger
 from streamlit_folium import st_folium
-from folium.plugins import Draw
+from folium.plugins import Draw, FastMarkerCluster
 
 from google_maps_list_filter.io_utils import (
     extract_zip,
     list_saved_csvs,
     read_saved_csv,
 )
-from google_maps_list_filter.map_utils import filter_geojson_by_geometry, geocode_places
-from google_maps_list_filter.description_generator import generate_place_description
+from google_maps_list_filter.map_utils import (
+    build_point_tree,
+    extract_point_coordinates,
+    filter_geojson_by_geometry,
+    geocode_places,
+)
+from google_maps_list_filter.description_generator import (
+    PlaceDescription,
+    generate_place_description,
+    generate_place_descriptions_batch,
+)
 
 # Load environment variables
 load_dotenv()
@@ -28,6 +42,15 @@ load_dotenv()
 # Add wide layout configuration for Streamlit app
 st.set_page_config(page_title="Google Maps Saved Places Filter", layout="wide")
 
+# Number of concurrent OpenAI requests when generating descriptions
+DESCRIPTION_WORKERS = 8
+# Maximum number of progress bar redraws while generating descriptions
+PROGRESS_UPDATES = 100
+# Leaflet callback turning each [lat, lon, name] row into a marker with a popup
+MARKER_CALLBACK = """function (row) {
+    return L.marker(new L.LatLng(row[0], row[1])).bindPopup(row[2]);
+}"""
+
 
 # ----- CACHING HELPERS -----
 @st.cache_data(show_spinner=False)
@@ -35,13 +58,101 @@ def geocode_rows(rows, api_key: str, osm_email: str) -> dict:
     """
     Geocode a list of place rows to GeoJSON, cached by rows-hash + credentials.
     """
-    client = googlemaps.Client(key=api_key)
-    return geocode_places(rows, client, osm_email)
+    return geocode_places(rows, api_key, osm_email)
+
+
+@st.cache_data(show_spinner=False)
+def describe_place(
+    title: str, categories: tuple[str, ...], _openai_key: str
+) -> PlaceDescription:
+    """
+    Generate a place description, memoized in-process before hitting the disk cache.
+    """
+    return generate_place_description(title, list(categories), _openai_key)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_map(
+    uploaded_hash: str,
+    csv_choice: str,
+    feature_count: int,
+    _point_coordinates: tuple[list[dict], np.ndarray, np.ndarray],
+) -> folium.Map:
+    """
+    Build the folium map with all places and the draw tool, once per upload + list selection.
+    """
+    point_features, lons, lats = _point_coordinates
+    if len(lons):
+        centroid = [float(lats.mean()), float(lons.mean())]
+        m = folium.Map(location=centroid, zoom_start=4)
+    else:
+        m = folium.Map(zoom_start=2)
+    # Render all places as a single clustered layer instead of one Marker per place
+    names = [feat["properties"]["location"]["name"] for feat in point_features]
+    marker_rows = [
+        [lat, lon, name]
+        for (lat, lon), name in zip(np.column_stack([lats, lons]).tolist(), names)
+    ]
+    FastMarkerCluster(marker_rows, callback=MARKER_CALLBACK).add_to(m)
+    Draw(export=True).add_to(m)
+    return m
 
 
 # ----- UTILITIES -----
-def hash_bytes(b: bytes) -> str:
-    return hashlib.md5(b).hexdigest()
+def hash_file(path: Path) -> str:
+    """
+    Hash a file's contents with BLAKE3, memory-mapping it instead of reading it in full.
+
+    Only used as a stable key to detect new uploads, so a truncated digest is enough.
+
+    Args:
+        path (Path): Path of the file to hash.
+
+    Returns:
+        str: 16-byte BLAKE3 digest as a hex string.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be memory-mapped
+            return blake3().hexdigest(length=16)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return blake3(mm).hexdigest(length=16)
+
+
+def set_description(feat: dict, description: PlaceDescription | None) -> None:
+    """
+    Store a generated description in a feature's properties (empty if generation failed).
+    """
+    if description is None:
+        feat["properties"]["description"] = ""
+        return
+    feat["properties"]["description"] = description.description
+    feat["properties"]["title"] = description.title
+    feat["properties"]["categories"] = list(description.categories)
+
+
+def build_mymaps_csv(geojson: dict) -> str:
+    """
+    Build a Google My Maps CSV (name, description, categories, WKT) from point features.
+    """
+    point_features, lons, lats = extract_point_coordinates(geojson)
+    props = [feat.get("properties", {}) for feat in point_features]
+    df = pd.DataFrame(
+        {
+            "name": [
+                p.get("title") or p.get("location", {}).get("name", "") for p in props
+            ],
+            "description": [p.get("description", "") for p in props],
+            "categories": [", ".join(p.get("categories", [])) for p in props],
+            # Format all WKT points in one vectorized string operation
+            "WKT": "POINT("
+            + pd.Series(lons).astype(str)
+            + " "
+            + pd.Series(lats).astype(str)
+            + ")",
+        }
+    )
+    return df.to_csv(index=False)
 
 
 # ----- APP BEGINS -----
@@ -119,28 +230,38 @@ def main():
     )
     if not uploaded:
         return
-    uploaded_hash = hash_bytes(uploaded.getvalue())
-    # New upload? extract once and reset state
-    if st.session_state.get("uploaded_hash") != uploaded_hash:
+    # Handle each upload only once; reruns skip straight to the next steps
+    if st.session_state.get("uploaded_file_id") != uploaded.file_id:
+        # Write the upload to disk once and hash the file through a memory map,
+        # instead of materializing extra copies of the ZIP bytes
         tmpdir = tempfile.mkdtemp()
         zip_path = Path(tmpdir) / "takeout.zip"
-        zip_path.write_bytes(uploaded.getvalue())
-        extract_zip(str(zip_path), tmpdir)
-        csv_paths = list_saved_csvs(tmpdir)
-        if not csv_paths:
-            st.error("No CSVs found in 'Saved' folders of your ZIP.")
-            return
-        st.session_state.update(
-            {
-                "uploaded_hash": uploaded_hash,
-                "tmpdir": tmpdir,
-                "csv_paths": csv_paths,
-                "geodata": None,
-                "filtered": None,
-                "descriptions_generated": False,
-                "last_csv": None,
-            }
-        )
+        zip_path.write_bytes(uploaded.getbuffer())
+        uploaded_hash = hash_file(zip_path)
+        # New content? extract once and reset state
+        if st.session_state.get("uploaded_hash") != uploaded_hash:
+            extract_zip(str(zip_path), tmpdir)
+            csv_paths = list_saved_csvs(tmpdir)
+            if not csv_paths:
+                st.error("No CSVs found in 'Saved' folders of your ZIP.")
+                return
+            st.session_state.update(
+                {
+                    "uploaded_hash": uploaded_hash,
+                    "tmpdir": tmpdir,
+                    "csv_paths": csv_paths,
+                    "geodata": None,
+                    "point_coordinates": None,
+                    "point_tree": None,
+                    "filtered": None,
+                    "descriptions_generated": False,
+                    "last_csv": None,
+                }
+            )
+        else:
+            # Same ZIP uploaded again; keep the existing extraction
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        st.session_state.uploaded_file_id = uploaded.file_id
 
     # --- Step 2: Pick CSV List ---
     csv_names = [Path(p).stem for p in st.session_state.csv_paths]
@@ -152,6 +273,8 @@ def main():
             {
                 "last_csv": selected,
                 "geodata": None,
+                "point_coordinates": None,
+                "point_tree": None,
                 "filtered": None,
                 "descriptions_generated": False,
             }
@@ -169,24 +292,30 @@ def main():
     if st.session_state.geodata is None:
         return
     geodata = st.session_state.geodata
+    # Extract the coordinate arrays once per geocoded list
+    if st.session_state.point_coordinates is None:
+        st.session_state.point_coordinates = extract_point_coordinates(geodata)
+        # Index the points once so every polygon redraw is a cheap tree query
+        _, lons, lats = st.session_state.point_coordinates
+        st.session_state.point_tree = build_point_tree(lons, lats)
 
     # --- Step 4: Draw & Filter ---
     st.subheader("Map & Draw Filter Polygon")
-    coords = [
-        feat["geometry"]["coordinates"][::-1] for feat in geodata.get("features", [])
-    ]
-    if coords:
-        lats, lons = zip(*coords)
-        centroid = [sum(lats) / len(lats), sum(lons) / len(lons)]
-        m = folium.Map(location=centroid, zoom_start=4)
-    else:
-        m = folium.Map(zoom_start=2)
-    for feat in geodata.get("features", []):
-        lon, lat = feat["geometry"]["coordinates"]
-        name = feat["properties"]["location"]["name"]
-        folium.Marker([lat, lon], popup=name).add_to(m)
-    Draw(export=True).add_to(m)
-    draw_result = st_folium(m, height=600, width=800)
+    m = build_map(
+        st.session_state.uploaded_hash,
+        choice,
+        len(geodata.get("features", [])),
+        st.session_state.point_coordinates,
+    )
+    # A stable key and a single returned object keep the map widget from being
+    # re-created and limit the Python<->JS payload to what we actually read
+    draw_result = st_folium(
+        m,
+        height=600,
+        key=f"map_{st.session_state.uploaded_hash}_{choice}",
+        returned_objects=["last_active_drawing"],
+        use_container_width=True,
+    )
 
     # Ensure 'filtered' always defined
     filtered = st.session_state.get("filtered")
@@ -194,7 +323,12 @@ def main():
         geom = draw_result["last_active_drawing"]["geometry"]
         if st.session_state.get("last_geom") != geom:
             if st.button("Apply filter", key="apply_filter"):
-                filtered = filter_geojson_by_geometry(geodata, geom)
+                filtered = filter_geojson_by_geometry(
+                    geodata,
+                    geom,
+                    st.session_state.point_coordinates,
+                    st.session_state.point_tree,
+                )
                 st.session_state.filtered = filtered
                 st.session_state.last_geom = geom
                 st.session_state.descriptions_generated = False
@@ -204,26 +338,90 @@ def main():
     # --- Step 5: Generate AI Descriptions ---
     st.subheader("AI-generated Descriptions")
     if not st.session_state.descriptions_generated:
+        use_batch = st.checkbox(
+            "Use the OpenAI Batch API (about half the cost and no web search, but can take a long time)",
+            key="use_batch",
+        )
         if st.button("Generate descriptions", key="gen_desc"):
             if not openai_key:
                 st.error("OpenAI API key is required for descriptions.")
             else:
+                # Work on a snapshot so a rerun mid-generation never leaves
+                # half-described features in the session state (or in geodata,
+                # which shares the same feature dicts)
+                filtered = copy.deepcopy(filtered)
                 features = filtered.get("features", [])
-                progress = st.progress(0)
-                total = len(features)
-                for i, feat in tqdm(
-                    enumerate(features), desc="Generating descriptions", total=total
-                ):
-                    title = feat["properties"]["location"]["name"]
-                    cats = feat["properties"].get("categories", [])
-                    try:
-                        model = generate_place_description(title, cats, openai_key)
-                        feat["properties"]["description"] = model.description
-                        feat["properties"]["title"] = model.title
-                        feat["properties"]["categories"] = model.categories
-                    except Exception:
-                        feat["properties"]["description"] = ""
-                    progress.progress((i + 1) / total)
+                # Describe each distinct (title, categories) pair only once,
+                # then fan the results out to every feature sharing it
+                place_keys = [
+                    (
+                        feat["properties"]["location"]["name"],
+                        tuple(sorted(feat["properties"].get("categories", []))),
+                    )
+                    for feat in features
+                ]
+                unique_places: dict[
+                    tuple[str, tuple[str, ...]], PlaceDescription | None
+                ] = dict.fromkeys(place_keys)
+                if use_batch:
+                    # A single batch submission instead of one request per place
+                    with st.spinner("Waiting for the OpenAI batch to complete..."):
+                        try:
+                            descriptions = generate_place_descriptions_batch(
+                                [
+                                    (title, list(categories))
+                                    for title, categories in unique_places
+                                ],
+                                openai_key,
+                            )
+                        except TimeoutError as e:
+                            # The batch keeps running; generating again collects it
+                            st.warning(f"{e}. Click 'Generate descriptions' again.")
+                            return
+                        except Exception as e:
+                            st.error(f"OpenAI batch failed: {e}")
+                            descriptions = [None] * len(unique_places)
+                    unique_places = dict(zip(unique_places, descriptions))
+                else:
+                    progress = st.progress(0)
+                    total = len(unique_places)
+                    # Each progress update round-trips through the websocket, so
+                    # redraw at most PROGRESS_UPDATES times
+                    progress_step = max(1, total // PROGRESS_UPDATES)
+                    # Each description is an I/O-bound OpenAI round-trip, so run them concurrently
+                    with ThreadPoolExecutor(
+                        max_workers=DESCRIPTION_WORKERS
+                    ) as executor:
+                        futures = {
+                            executor.submit(
+                                describe_place, title, categories, openai_key
+                            ): (title, categories)
+                            for title, categories in unique_places
+                        }
+                        failures = 0
+                        for done, future in enumerate(as_completed(futures), start=1):
+                            try:
+                                unique_places[futures[future]] = future.result()
+                            except (
+                                openai.OpenAIError,
+                                ValidationError,
+                                ValueError,
+                            ) as e:
+                                # Leave the place without a description
+                                failures += 1
+                                logger.warning(
+                                    "Failed to describe place: {title}, error: {error}",
+                                    title=futures[future][0],
+                                    error=str(e),
+                                )
+                            if done % progress_step == 0 or done == total:
+                                progress.progress(done / total)
+                    if failures:
+                        st.warning(
+                            f"Could not generate descriptions for {failures} of {total} places."
+                        )
+                for feat, place_key in zip(features, place_keys):
+                    set_description(feat, unique_places[place_key])
                 st.session_state.filtered = filtered
                 st.session_state.descriptions_generated = True
     else:
@@ -231,27 +429,18 @@ def main():
 
     # --- Step 6: Download ---
     st.subheader("Downloads")
-    geojson_str = json.dumps(filtered, indent=2)
+    geojson_bytes = orjson.dumps(filtered, option=orjson.OPT_INDENT_2)
     st.download_button(
         "Download filtered GeoJSON",
-        geojson_str,
+        geojson_bytes,
         file_name="filtered_saved_places.geojson",
         mime="application/json",
     )
 
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(["name", "description", "categories", "WKT"])
-    for feat in filtered["features"]:
-        lon, lat = feat["geometry"]["coordinates"]
-        props = feat.get("properties", {})
-        name = props.get("title") or props.get("location", {}).get("name", "")
-        desc = props.get("description", "")
-        categories = props.get("categories", [])
-        writer.writerow([name, desc, ", ".join(categories), f"POINT({lon} {lat})"])
+    mymaps_csv = build_mymaps_csv(filtered)
     st.download_button(
         "Download CSV to import in Google My Maps",
-        buf.getvalue(),
+        mymaps_csv,
         file_name="filtered_saved_places_mymaps.csv",
         mime="text/csv",
     )
@@ -2,11 +2,36 @@
 Module for generating AI-powered descriptions of geocoded places using OpenAI and Pydantic for structured outputs.
 """
 
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
 import backoff
+import diskcache
 import openai
 from loguru import logger
 from pydantic import BaseModel, Field, ValidationError
 
+# Persistent cache of generated descriptions, shared across sessions and app restarts
+DESCRIPTION_CACHE_DIR = Path.home() / ".gmlf_cache"
+# Set this environment variable to store the description cache somewhere else
+DESCRIPTION_CACHE_DIR_ENV = "GMLF_DESCRIPTION_CACHE_DIR"
+# Opened on first use by _get_description_cache
+_description_cache: diskcache.Cache | None = None
+
+DEFAULT_MODEL = "gpt-4o-mini-search-preview"
+DEFAULT_SYSTEM_PROMPT = "You are an assistant that writes concise, informative descriptions of places. Always write in English."
+# The Batch API doesn't serve search models, so batches use a plain chat model
+DEFAULT_BATCH_MODEL = "gpt-4o-mini"
+# How long the app waits on a batch before leaving it to be collected later
+DEFAULT_BATCH_MAX_WAIT_SECONDS = 10 * 60
+# How long a running batch's id is kept, past its 24h completion window
+BATCH_ID_EXPIRE_SECONDS = 2 * 24 * 60 * 60
+# Batch statuses after which the batch will not make any more progress
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
 
 class PlaceDescription(BaseModel):
     """
@@ -18,6 +43,87 @@ class PlaceDescription(BaseModel):
     description: str = Field(description="AI-generated brief description of the place.")
 
 
+def _get_description_cache() -> diskcache.Cache:
+    """
+    Opens the description cache on first use, so importing this module creates no directory.
+
+    Returns:
+        diskcache.Cache: The persistent description cache.
+    """
+    global _description_cache
+    if _description_cache is None:
+        _description_cache = diskcache.Cache(
+            os.environ.get(DESCRIPTION_CACHE_DIR_ENV) or DESCRIPTION_CACHE_DIR
+        )
+    return _description_cache
+
+
+def _description_cache_key(
+    place_title: str, categories: list[str], model: str, system_prompt: str
+) -> str:
+    """
+    Builds a stable cache key for a description request.
+
+    Args:
+        place_title (str): Title of the place.
+        categories (list[str]): Categories associated with the place, in any order.
+        model (str): Chat model name used for completion.
+        system_prompt (str): System prompt guiding the assistant.
+
+    Returns:
+        str: SHA-256 hex digest identifying the request.
+    """
+    payload = json.dumps([place_title, sorted(categories), model, system_prompt])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _build_response_format() -> dict:
+    """
+    Builds the structured output format for a PlaceDescription, for raw API requests.
+
+    Returns:
+        dict: A strict "json_schema" response format built from the Pydantic model.
+    """
+    schema = PlaceDescription.model_json_schema()
+    # Strict structured outputs reject objects that allow extra properties
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": PlaceDescription.__name__,
+            "schema": schema,
+            "strict": True,
+        },
+    }
+
+
+def _build_messages(
+    place_title: str, categories: list[str], system_prompt: str
+) -> list[dict[str, str]]:
+    """
+    Builds the chat messages asking for a description of a place.
+
+    Args:
+        place_title (str): Title of the place.
+        categories (list[str]): Categories associated with the place.
+        system_prompt (str): System prompt guiding the assistant.
+
+    Returns:
+        list[dict[str, str]]: System and user messages for the chat completion.
+    """
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": (
+                f"Place name: {place_title}\n"
+                f"Categories: {', '.join(categories)}\n"
+                "Provide a concise description:"
+            ),
+        },
+    ]
+
+
 @backoff.on_exception(
     backoff.expo,
     Exception,
@@ -28,14 +134,15 @@ def generate_place_description(
     place_title: str,
     categories: list[str],
     openai_api_key: str,
-    model: str = "gpt-4o-mini-search-preview",
-    system_prompt: str = (
-        "You are an assistant that writes concise, informative descriptions of places. Always write in English."
-    ),
+    model: str = DEFAULT_MODEL,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
 ) -> PlaceDescription:
     """
     Generates a brief description for a place using OpenAI chat completion.
 
+    Results are stored in a persistent on-disk cache keyed by title, categories,
+    model and system prompt, so repeated requests skip the API call entirely.
+
     Args:
         place_title (str): Title of the place.
         categories (list[str]): Categories associated with the place.
@@ -48,28 +155,33 @@ def generate_place_description(
 
     Raises:
         ValidationError: If the AI response cannot be validated against the schema.
+        ValueError: If the AI response has no parsed description, e.g. on a refusal.
         Exception: For OpenAI API errors.
     """
+    cache_key = _description_cache_key(place_title, categories, model, system_prompt)
+    cached = _get_description_cache().get(cache_key)
+    if cached is not None:
+        logger.debug("Using cached description for place: {title}", title=place_title)
+        return PlaceDescription(**cached)
+
     client = openai.Client(api_key=openai_api_key)
 
     try:
         completion = client.beta.chat.completions.parse(
             model=model,
             web_search_options={"search_context_size": "low"},  # type: ignore
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": (
-                        f"Place name: {place_title}\n"
-                        f"Categories: {', '.join(categories)}\n"
-                        "Provide a concise description:"
-                    ),
-                },
-            ],
+            messages=_build_messages(place_title, categories, system_prompt),
             response_format=PlaceDescription,
         )
-        parsed: PlaceDescription = completion.choices[0].message.parsed
+        message = completion.choices[0].message
+        if message.parsed is None:
+            # Raise rather than return None, so backoff retries it and callers that
+            # memoize the result (e.g. st.cache_data) never cache a missing description
+            raise ValueError(
+                f"OpenAI returned no parsed description, refusal: {message.refusal}"
+            )
+        parsed: PlaceDescription = message.parsed
+        _get_description_cache()[cache_key] = parsed.model_dump()
         return parsed
 
     except ValidationError as ve:
@@ -82,3 +194,160 @@ def generate_place_description(
             error=str(e),
         )
         raise
+
+
+def _batch_cache_key(request_keys: list[str]) -> str:
+    """
+    Builds the cache key under which the id of a batch for some requests is stored.
+
+    Args:
+        request_keys (list[str]): Description cache keys of the requests in the batch, in any order.
+
+    Returns:
+        str: Cache key identifying that set of requests.
+    """
+    payload = json.dumps(sorted(request_keys))
+    return "batch:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def generate_place_descriptions_batch(
+    places: list[tuple[str, list[str]]],
+    openai_api_key: str,
+    model: str = DEFAULT_BATCH_MODEL,
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+    poll_interval_seconds: float = 10.0,
+    max_wait_seconds: float = DEFAULT_BATCH_MAX_WAIT_SECONDS,
+) -> list[PlaceDescription | None]:
+    """
+    Generates descriptions for many places at once through the OpenAI Batch API.
+
+    Places already in the on-disk cache are served from it; the rest are uploaded as a
+    single JSONL batch, which is polled until it finishes. New results are cached.
+    The batch id is kept in the cache until the batch finishes, so a call for the same
+    places after a timeout or an app restart picks up the running batch instead of
+    submitting (and paying for) a new one.
+
+    Args:
+        places (list[tuple[str, list[str]]]): Title and categories of each place.
+        openai_api_key (str): API key for OpenAI.
+        model (str): Chat model name to use for completion. Search models aren't
+            available through the Batch API, hence the different default.
+        system_prompt (str): System prompt guiding the assistant.
+        poll_interval_seconds (float): Seconds to wait between batch status checks.
+        max_wait_seconds (float): Seconds to wait for the batch before giving up.
+
+    Returns:
+        list[PlaceDescription | None]: Descriptions aligned with `places`, with None
+            for places whose request failed.
+
+    Raises:
+        TimeoutError: If the batch is still running after `max_wait_seconds`.
+        Exception: For OpenAI API errors while submitting or polling the batch.
+    """
+    cache = _get_description_cache()
+    descriptions: list[PlaceDescription | None] = [None] * len(places)
+    # Places sharing a cache key share a request, identified by that key
+    pending: dict[str, list[int]] = {}
+    for idx, (title, categories) in enumerate(places):
+        cache_key = _description_cache_key(title, categories, model, system_prompt)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            descriptions[idx] = PlaceDescription(**cached)
+        else:
+            pending.setdefault(cache_key, []).append(idx)
+    logger.info(
+        "{cached} of {total} descriptions found in cache",
+        cached=sum(description is not None for description in descriptions),
+        total=len(places),
+    )
+    if not pending:
+        return descriptions
+
+    client = openai.Client(api_key=openai_api_key)
+    batch_key = _batch_cache_key(list(pending))
+    batch_id = cache.get(batch_key)
+    if batch_id is not None:
+        batch = client.batches.retrieve(batch_id)
+        logger.info("Resuming OpenAI batch {batch_id}", batch_id=batch_id)
+    else:
+        # One chat completion request per distinct place
+        response_format = _build_response_format()
+        batch_lines = [
+            json.dumps(
+                {
+                    "custom_id": cache_key,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": _build_messages(*places[idxs[0]], system_prompt),
+                        "response_format": response_format,
+                    },
+                }
+            )
+            for cache_key, idxs in pending.items()
+        ]
+        batch_file = client.files.create(
+            file=("place_descriptions.jsonl", "\n".join(batch_lines).encode()),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        cache.set(batch_key, batch.id, expire=BATCH_ID_EXPIRE_SECONDS)
+        logger.info(
+            "Submitted OpenAI batch {batch_id} with {count} requests",
+            batch_id=batch.id,
+            count=len(pending),
+        )
+    deadline = time.monotonic() + max_wait_seconds
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"OpenAI batch {batch.id} is still {batch.status}; "
+                "run again later to collect its results"
+            )
+        time.sleep(poll_interval_seconds)
+        batch = client.batches.retrieve(batch.id)
+    # The batch won't make any more progress, so a new call should submit a new one
+    cache.delete(batch_key)
+    if batch.status != "completed" or batch.output_file_id is None:
+        logger.error(
+            "OpenAI batch {batch_id} ended with status {status}",
+            batch_id=batch.id,
+            status=batch.status,
+        )
+        return descriptions
+
+    # Map each result back to its places through the custom_id
+    output = client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line:
+            continue
+        result = json.loads(line)
+        cache_key = result["custom_id"]
+        idxs = pending.get(cache_key)
+        if idxs is None:
+            continue
+        try:
+            content = result["response"]["body"]["choices"][0]["message"]["content"]
+            parsed = PlaceDescription.model_validate_json(content)
+        except (KeyError, IndexError, TypeError, ValidationError) as e:
+            logger.error(
+                "Invalid batch result for place: {title}, error: {error}",
+                title=places[idxs[0]][0],
+                error=str(e),
+            )
+            continue
+        for idx in idxs:
+            descriptions[idx] = parsed
+        cache[cache_key] = parsed.model_dump()
+    logger.success(
+        "{count} of {total} places described after OpenAI batch {batch_id}",
+        count=sum(description is not None for description in descriptions),
+        total=len(places),
+        batch_id=batch.id,
+    )
+    return descriptions
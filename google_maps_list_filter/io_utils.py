@@ -1,9 +1,21 @@
-import zipfile
-import json
 import csv
-from pathlib import Path
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+import orjson
+import pandas as pd
 from loguru import logger
 
+# Takeout folders that never hold saved places lists, so searches never descend into them
+IGNORED_TAKEOUT_DIRS = {
+    "Google Photos",
+    "YouTube and YouTube Music",
+    "Drive",
+    "Mail",
+    "Location History",
+    "Location History (Timeline)",
+}
+
 
 def extract_saved_places_json(zip_path: str, output_dir: str) -> str:
     """
@@ -23,15 +35,16 @@ def extract_saved_places_json(zip_path: str, output_dir: str) -> str:
     output_dir: Path = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    logger.info("Extracting zip file: {zip}", zip=str(zip_path))
+    logger.info(
+        "Searching for 'Saved Places.json' in zip file: {zip}", zip=str(zip_path)
+    )
     with zipfile.ZipFile(zip_path, "r") as zip_ref:
-        zip_ref.extractall(output_dir)
-
-    # Search for the GeoJSON file
-    logger.info("Searching for 'Saved Places.json' in {dir}", dir=str(output_dir))
-    for path in output_dir.rglob("Saved Places.json"):
-        logger.success("Found Saved Places.json at {path}", path=str(path))
-        return str(path)
+        # Only extract the file we need instead of the whole (often huge) archive
+        for info in zip_ref.infolist():
+            if PurePosixPath(info.filename).name == "Saved Places.json":
+                path = zip_ref.extract(info, output_dir)
+                logger.success("Found Saved Places.json at {path}", path=path)
+                return path
 
     error_msg = "Saved Places.json not found in the provided ZIP file."
     logger.error(error_msg)
@@ -50,8 +63,8 @@ def load_geojson(json_path: str) -> dict:
     """
     json_path: Path = Path(json_path)
     logger.info("Loading GeoJSON file: {path}", path=str(json_path))
-    with json_path.open("r", encoding="utf-8") as f:
-        data: dict = json.load(f)
+    with json_path.open("rb") as f:
+        data: dict = orjson.loads(f.read())
     logger.success(
         "Loaded GeoJSON with {count} features.", count=len(data.get("features", []))
     )
@@ -61,9 +74,20 @@ def load_geojson(json_path: str) -> dict:
 def list_saved_csvs(extract_dir: str) -> list[str]:
     """
     Searches the extracted directory for CSV files in any 'Saved' folder.
+
+    Known Takeout folders without saved places (e.g. photos) are pruned from the walk.
     """
-    root = Path(extract_dir)
-    csv_paths = [str(p) for p in root.rglob("Saved/*.csv")]
+    csv_paths: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(extract_dir):
+        # Prune in place so os.walk never descends into irrelevant folders
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_TAKEOUT_DIRS]
+        if Path(dirpath).name == "Saved":
+            csv_paths.extend(
+                os.path.join(dirpath, filename)
+                for filename in filenames
+                if filename.endswith(".csv")
+            )
+    csv_paths.sort()
     logger.info("Found {count} CSV files in 'Saved' folders", count=len(csv_paths))
     return csv_paths
 
@@ -71,19 +95,49 @@ def list_saved_csvs(extract_dir: str) -> list[str]:
 def read_saved_csv(csv_path: str) -> list[dict]:
     """
     Reads a CSV of saved Google Maps places and returns a list of rows.
+
+    Every value is read as a string, with empty cells kept as empty strings.
+    Files the fast pyarrow parser rejects (e.g. empty, or with rows holding more
+    fields than the header) are read with the more lenient `csv.DictReader`.
     """
-    rows: list[dict] = []
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append(row)
+    try:
+        rows: list[dict] = pd.read_csv(
+            csv_path,
+            engine="pyarrow",
+            dtype="string[pyarrow]",
+            keep_default_na=False,
+        ).to_dict(orient="records")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        logger.warning(
+            "Falling back to the csv module for CSV: {csv}, error: {error}",
+            csv=csv_path,
+            error=str(e),
+        )
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
     logger.success("Read {count} rows from CSV: {csv}", count=len(rows), csv=csv_path)
     return rows
 
 
+def _is_saved_csv(member_name: str) -> bool:
+    """
+    Checks whether a ZIP member is a CSV file directly inside a 'Saved' folder.
+
+    Args:
+        member_name (str): Name of the member inside the ZIP archive.
+
+    Returns:
+        bool: True if the member is a saved places list CSV, False otherwise.
+    """
+    member_path = PurePosixPath(member_name)
+    return member_path.suffix == ".csv" and member_path.parent.name == "Saved"
+
+
 def extract_zip(zip_path: str, output_dir: str) -> None:
     """
-    Extracts all contents of a ZIP file to the output directory.
+    Extracts the saved places CSVs ('Saved/*.csv') of a ZIP file to the output directory.
+
+    Other members of the archive (photos, histories, etc.) are not written to disk.
 
     Args:
         zip_path (str): Path to the ZIP file.
@@ -93,6 +147,11 @@ def extract_zip(zip_path: str, output_dir: str) -> None:
     output_dir_obj = Path(output_dir)
     output_dir_obj.mkdir(parents=True, exist_ok=True)
 
-    logger.info("Extracting ZIP file to {dir}", dir=str(output_dir_obj))
+    logger.info("Extracting saved places CSVs to {dir}", dir=str(output_dir_obj))
     with zipfile.ZipFile(zip_path_obj, "r") as zip_ref:
-        zip_ref.extractall(output_dir_obj)
+        saved_csvs = [
+            info for info in zip_ref.infolist() if _is_saved_csv(info.filename)
+        ]
+        for info in saved_csvs:
+            zip_ref.extract(info, output_dir_obj)
+    logger.info("Extracted {count} saved places CSVs", count=len(saved_csvs))
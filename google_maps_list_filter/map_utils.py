@@ -1,77 +1,400 @@
+import asyncio
+import copy
+import os
 import re
-from typing import Any, Dict, Optional
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+from typing import Any
+import aiohttp
 import backoff
-from shapely.geometry import shape, Point, Polygon, MultiPolygon
-from tqdm.auto import tqdm
+import diskcache
+import numpy as np
+import shapely
+from shapely.geometry import shape, Polygon, MultiPolygon
 from loguru import logger
+from tqdm.auto import tqdm
+from geopy.adapters import AioHTTPAdapter
+from geopy.extra.rate_limiter import AsyncRateLimiter
 from geopy.geocoders import Nominatim, ArcGIS
 from geopy.exc import GeopyError
 
+# Google Maps Geocoding API endpoint
+GOOGLE_GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+# Maximum number of rows being geocoded at the same time
+GEOCODE_CONCURRENCY = 10
+# Maximum number of Google Maps geocoding requests started per second
+GEOCODE_RATE_LIMIT_RPS = 10
+# How long resolved hostnames are reused by the geocoding connection pool
+DNS_CACHE_TTL_SECONDS = 300
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_DELAY_SECONDS = 1.0
+# Consecutive Nominatim failures after which it is skipped for the rest of a run
+NOMINATIM_MAX_CONSECUTIVE_FAILURES = 3
+# Persistent cache of geocoding responses, so duplicates and re-runs skip the APIs
+GEOCODE_CACHE_DIR = Path.home() / ".gmlf_geocode_cache"
+GEOCODE_CACHE_EXPIRE_SECONDS = 30 * 24 * 60 * 60
+# Set this environment variable to store the geocode cache somewhere else
+GEOCODE_CACHE_DIR_ENV = "GMLF_GEOCODE_CACHE_DIR"
+# Set this environment variable to a non-empty value to bypass the geocode cache
+GEOCODE_CACHE_DISABLE_ENV = "GMLF_DISABLE_GEOCODE_CACHE"
+# Opened on first use by _get_geocode_cache
+_geocode_cache: diskcache.Cache | None = None
+# Returned by the cache on a miss, as None is a valid cached "not found" result
+_CACHE_MISS = object()
+# DMS coordinates, e.g. 4°41'02.9"N 74°02'54.5"W
+# Regex breakdown:
+#  - Degrees: 1–3 digits (00 to 180 for lon, 00 to 90 for lat but we won't strictly enforce ranges here)
+#  - Minutes: exactly 2 digits (00 to 59)
+#  - Seconds: 2 digits plus optional fraction (00.0 to 59.999...)
+#  - Direction: one of N, S, E, or W
+# Compiled once at import, as every title is checked against it
+_DMS_PATTERN = re.compile(
+    r"""
+    ^\s*                                  # optional leading whitespace
+    ([0-9]{1,3})°([0-5][0-9])'(\d{2}(?:\.\d+)?)"  # latitude DMS
+    \s*([NS])                             # N or S
+    [,\s]+                                # separator (comma and/or space)
+    ([0-9]{1,3})°([0-5][0-9])'(\d{2}(?:\.\d+)?)"  # longitude DMS
+    \s*([EW])                             # E or W
+    \s*$                                  # optional trailing whitespace
+""",
+    re.VERBOSE | re.IGNORECASE,
+)
+# Decimal degrees "lat, lon" at the start of a title, e.g. 4.684139, -74.048472
+_DECIMAL_COORDS_PATTERN = re.compile(
+    r"^\s*([-+]?\d{1,2}\.\d+)\s*,\s*([-+]?\d{1,3}\.\d+)(?=\s|$)"
+)
 
-def filter_geojson_by_geometry(
-    places_geojson: Dict[str, Any], filter_geometry: Dict[str, Any]
-) -> Dict[str, Any]:
+
+def extract_point_coordinates(
+    places_geojson: dict[str, Any],
+) -> tuple[list[dict[str, Any]], np.ndarray, np.ndarray]:
     """
-    Filters a GeoJSON FeatureCollection of point features by a provided polygon geometry.
+    Extracts the coordinates of the Point features of a GeoJSON FeatureCollection.
+
+    The longitudes and latitudes are returned as two float64 arrays (structure of
+    arrays), so they can be reused for vectorized operations.
 
     Args:
-        places_geojson (Dict[str, Any]): The original GeoJSON FeatureCollection containing point features.
-        filter_geometry (Dict[str, Any]): A GeoJSON geometry object (Polygon or MultiPolygon) to filter points by.
+        places_geojson (dict[str, Any]): GeoJSON FeatureCollection containing point features.
 
     Returns:
-        Dict[str, Any]: A new GeoJSON FeatureCollection containing only the input features whose points fall within the filter_geometry.
+        tuple[list[dict[str, Any]], np.ndarray, np.ndarray]: The Point features, and their
+            longitudes and latitudes, aligned by index.
     """
-    # Convert filter geometry to a Shapely shape
-    polygon = shape(filter_geometry)
-    if not isinstance(polygon, (Polygon, MultiPolygon)):
-        error_msg = "filter_geometry must be a Polygon or MultiPolygon GeoJSON geometry"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    filtered_features: list[dict] = []
+    point_features: list[dict[str, Any]] = []
     for feature in places_geojson.get("features", []):
         geom = feature.get("geometry")
         if not geom:
             continue
-        point = shape(geom)
-        if not isinstance(point, Point):
+        # Check the type on the raw dict, instead of building a Shapely geometry
+        # just to read two floats
+        if geom.get("type") != "Point":
             logger.warning("Skipped non-Point geometry: {geom}", geom=geom)
             continue
-        if polygon.contains(point):
-            # Retain the original feature dict
-            filtered_features.append(feature)
-
-    logger.info(
-        "Filtered {total} features down to {count} features",
-        total=len(places_geojson.get("features", [])),
-        count=len(filtered_features),
-    )
-    # Return a GeoJSON-like dict
-    return {"type": "FeatureCollection", "features": filtered_features}
+        point_features.append(feature)
+    # Read all (lon, lat) pairs in a single pass, ignoring any altitude value
+    coords = np.fromiter(
+        (c for f in point_features for c in f["geometry"]["coordinates"][:2]),
+        dtype=np.float64,
+        count=2 * len(point_features),
+    ).reshape(-1, 2)
+    lons, lats = coords[:, 0], coords[:, 1]
+    return point_features, lons, lats
+
+
+def build_point_tree(lons: np.ndarray, lats: np.ndarray) -> shapely.STRtree:
+    """
+    Builds a spatial index over points, to speed up repeated polygon filtering.
+
+    Args:
+        lons (np.ndarray): Longitudes of the points.
+        lats (np.ndarray): Latitudes of the points.
+
+    Returns:
+        shapely.STRtree: R-tree whose geometry indices match the input array positions.
+    """
+    return shapely.STRtree(shapely.points(lons, lats))
+
+
+def filter_geojson_by_geometries(
+    places_geojson: dict[str, Any],
+    filter_geometries: Iterable[dict[str, Any]],
+    point_coordinates: tuple[list[dict[str, Any]], np.ndarray, np.ndarray]
+    | None = None,
+    point_tree: shapely.STRtree | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Filters a GeoJSON FeatureCollection of point features by each of several polygon geometries.
+
+    Args:
+        places_geojson (dict[str, Any]): The original GeoJSON FeatureCollection containing point features.
+        filter_geometries (Iterable[dict[str, Any]]): GeoJSON geometry objects (Polygon or MultiPolygon) to filter points by.
+        point_coordinates (tuple[list[dict[str, Any]], np.ndarray, np.ndarray] | None): Output of
+            `extract_point_coordinates` for `places_geojson`, to avoid recomputing it on repeated calls.
+        point_tree (shapely.STRtree | None): Output of `build_point_tree` for those coordinates.
+            When not given and there is more than one polygon, a tree is built once and shared by all of them.
+
+    Returns:
+        list[dict[str, Any]]: One GeoJSON FeatureCollection per filter geometry, in the same order,
+            each containing only the input features whose points fall within that geometry.
+    """
+    # Convert and validate every filter geometry before doing any work
+    polygons = [shape(filter_geometry) for filter_geometry in filter_geometries]
+    for polygon in polygons:
+        if not isinstance(polygon, (Polygon, MultiPolygon)):
+            error_msg = (
+                "filter_geometry must be a Polygon or MultiPolygon GeoJSON geometry"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+    # Build GEOS' internal edge index once, so each point test is logarithmic
+    # in the number of polygon vertices instead of linear
+    shapely.prepare(polygons)
+
+    if point_coordinates is None:
+        point_coordinates = extract_point_coordinates(places_geojson)
+    point_features, lons, lats = point_coordinates
+    if point_tree is None and len(polygons) > 1:
+        # Amortize the index construction over all polygons
+        point_tree = build_point_tree(lons, lats)
+
+    total = len(places_geojson.get("features", []))
+    filtered_collections = []
+    for polygon in polygons:
+        if point_tree is not None:
+            # Query the spatial index, sorting to keep the original feature order
+            indices = np.sort(point_tree.query(polygon, predicate="contains"))
+        else:
+            # Cheaply discard points outside the polygon's bounding box (the union of
+            # all parts for a MultiPolygon) before handing the survivors to GEOS
+            minx, miny, maxx, maxy = polygon.bounds
+            candidates = np.flatnonzero(
+                (lons >= minx) & (lons <= maxx) & (lats >= miny) & (lats <= maxy)
+            )
+            # Test the remaining points in a single vectorized call
+            mask = shapely.contains_xy(polygon, lons[candidates], lats[candidates])
+            indices = candidates[mask]
+        # Retain the original feature dicts
+        filtered_features = [point_features[i] for i in indices]
+
+        logger.info(
+            "Filtered {total} features down to {count} features",
+            total=total,
+            count=len(filtered_features),
+        )
+        # Return a GeoJSON-like dict
+        filtered_collections.append(
+            {"type": "FeatureCollection", "features": filtered_features}
+        )
+    return filtered_collections
+
+
+def filter_geojson_by_geometry(
+    places_geojson: dict[str, Any],
+    filter_geometry: dict[str, Any],
+    point_coordinates: tuple[list[dict[str, Any]], np.ndarray, np.ndarray]
+    | None = None,
+    point_tree: shapely.STRtree | None = None,
+) -> dict[str, Any]:
+    """
+    Filters a GeoJSON FeatureCollection of point features by a provided polygon geometry.
+
+    Args:
+        places_geojson (dict[str, Any]): The original GeoJSON FeatureCollection containing point features.
+        filter_geometry (dict[str, Any]): A GeoJSON geometry object (Polygon or MultiPolygon) to filter points by.
+        point_coordinates (tuple[list[dict[str, Any]], np.ndarray, np.ndarray] | None): Output of
+            `extract_point_coordinates` for `places_geojson`, to avoid recomputing it on repeated calls.
+        point_tree (shapely.STRtree | None): Output of `build_point_tree` for those coordinates.
+            When given, only points whose bounding box intersects the polygon are tested.
 
+    Returns:
+        dict[str, Any]: A new GeoJSON FeatureCollection containing only the input features whose points fall within the filter_geometry.
+    """
+    return filter_geojson_by_geometries(
+        places_geojson,
+        [filter_geometry],
+        point_coordinates=point_coordinates,
+        point_tree=point_tree,
+    )[0]
 
-def _geocode_with_retry(query: str, gmaps_client: Any) -> list[dict]:
+
+def _normalize_query(query: str) -> str:
     """
-    Wraps gmaps_client.geocode in an exponential backoff retry on exceptions.
+    Normalizes a geocode query, so trivially different spellings share a cache entry.
 
     Args:
         query (str): The geocode query string.
-        gmaps_client (Any): Authenticated Google Maps client.
 
     Returns:
-        list[dict]: Geocoding results from the API.
+        str: The query in lowercase, without surrounding whitespace and with inner whitespace collapsed.
+    """
+    return " ".join(query.lower().split())
+
+
+def _get_geocode_cache() -> diskcache.Cache:
+    """
+    Opens the geocode cache on first use, so importing this module creates no directory.
+
+    Returns:
+        diskcache.Cache: The persistent geocode cache.
+    """
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = diskcache.Cache(
+            os.environ.get(GEOCODE_CACHE_DIR_ENV) or GEOCODE_CACHE_DIR
+        )
+    return _geocode_cache
+
+
+def _get_cached_geocode(service: str, query: str) -> Any:
     """
+    Looks up a geocoding response in the persistent cache.
 
-    @backoff.on_exception(
-        backoff.expo,
-        Exception,
-        max_tries=5,
-        max_time=60,
+    Args:
+        service (str): Name of the geocoding service the response came from.
+        query (str): The geocode query string.
+
+    Returns:
+        Any: The cached response, or `_CACHE_MISS` if there is none or the cache is disabled.
+    """
+    if os.environ.get(GEOCODE_CACHE_DISABLE_ENV):
+        return _CACHE_MISS
+    return _get_geocode_cache().get(
+        (service, _normalize_query(query)), default=_CACHE_MISS
+    )
+
+
+def _set_cached_geocode(service: str, query: str, response: Any) -> None:
+    """
+    Stores a geocoding response in the persistent cache, unless the cache is disabled.
+
+    Args:
+        service (str): Name of the geocoding service the response came from.
+        query (str): The geocode query string.
+        response (Any): The response to store, with None meaning "not found".
+    """
+    if os.environ.get(GEOCODE_CACHE_DISABLE_ENV):
+        return
+    _get_geocode_cache().set(
+        (service, _normalize_query(query)),
+        response,
+        expire=GEOCODE_CACHE_EXPIRE_SECONDS,
     )
-    def call():
-        return gmaps_client.geocode(query)
 
-    return call()
+
+class _RateLimiter:
+    """
+    Spaces out requests so that at most `rps` of them start in any given second.
+
+    Each caller reserves the next free time slot and sleeps until it comes up, so
+    concurrent coroutines are released one interval apart instead of in bursts.
+    """
+
+    def __init__(self, rps: float):
+        self._interval = 1.0 / rps
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """
+        Waits until the caller is allowed to send its request.
+        """
+        now = asyncio.get_running_loop().time()
+        # No await between reading and reserving the slot, so this is race-free
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class _CircuitBreaker:
+    """
+    Stops calling a failing service after too many consecutive errors.
+
+    Args:
+        name (str): Name of the guarded service, used in log messages.
+        max_failures (int): Number of consecutive failures after which the breaker opens.
+    """
+
+    def __init__(self, name: str, max_failures: int):
+        self.name = name
+        self.max_failures = max_failures
+        self.failures = 0
+        self.is_open = False
+
+    def record_success(self) -> None:
+        """
+        Resets the consecutive failure count.
+        """
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Counts a failure, opening the breaker once the limit is reached.
+        """
+        self.failures += 1
+        if self.failures >= self.max_failures and not self.is_open:
+            self.is_open = True
+            logger.warning(
+                "{name} failed {count} times in a row, skipping it from now on",
+                name=self.name,
+                count=self.failures,
+            )
+
+
+@backoff.on_exception(
+    backoff.expo,
+    Exception,
+    max_tries=5,
+    max_time=60,
+)
+async def _geocode_with_retry(
+    query: str,
+    session: aiohttp.ClientSession,
+    api_key: str,
+    rate_limiter: _RateLimiter,
+) -> list[dict]:
+    """
+    Queries the Google Maps Geocoding API, with an exponential backoff retry on exceptions.
+
+    Args:
+        query (str): The geocode query string.
+        session (aiohttp.ClientSession): HTTP session shared by all geocoding requests.
+        api_key (str): Google Maps API key.
+        rate_limiter (_RateLimiter): Limiter shared by all Google Maps requests, retries included.
+
+    Returns:
+        list[dict]: Geocoding results from the API.
+
+    Raises:
+        RuntimeError: If the API answers with an error status (e.g. OVER_QUERY_LIMIT).
+    """
+    # diskcache's memoize can't wrap coroutines, so the cache is checked by hand
+    cached = _get_cached_geocode("google", query)
+    if cached is not _CACHE_MISS:
+        return cached
+    await rate_limiter.wait()
+    async with session.get(
+        GOOGLE_GEOCODE_URL, params={"address": query, "key": api_key}
+    ) as response:
+        # raise_for_status() would put the request URL, API key included, in the
+        # error message and from there in the logs, so only report the status
+        if response.status >= 400:
+            raise RuntimeError(f"Google Maps geocoding HTTP {response.status}")
+        # Skip the content type check, whose error message also holds the URL
+        payload = await response.json(content_type=None)
+    status = payload.get("status")
+    if status == "ZERO_RESULTS":
+        results = []
+    elif status == "OK":
+        results = payload.get("results", [])
+    else:
+        raise RuntimeError(
+            f"Google Maps geocoding returned status {status}: "
+            f"{payload.get('error_message', '')}"
+        )
+    _set_cached_geocode("google", query, results)
+    return results
 
 
 @backoff.on_exception(
@@ -80,30 +403,61 @@ def _geocode_with_retry(query: str, gmaps_client: Any) -> list[dict]:
     max_tries=5,
     max_time=60,
 )
-def _nominatim_geocode(query: str, osm_email: str) -> Optional[dict[str, Any]]:
+async def _nominatim_geocode(
+    query: str, geocode: Callable[..., Awaitable[Any]]
+) -> dict[str, Any] | None:
     """
     Fallback geocoding using OpenStreetMap Nominatim service with retry on errors.
 
     Args:
         query (str): The geocode query string.
-        osm_email (str): Email address for Nominatim usage policy compliance.
+        geocode (Callable[..., Awaitable[Any]]): Rate-limited Nominatim geocode coroutine.
 
     Returns:
-        Optional[dict[str, Any]]: Geocoding result with 'lat', 'lon', and 'address', or None if not found.
+        dict[str, Any] | None: Geocoding result with 'lat', 'lon', and 'address', or None if not found.
+
+    Raises:
+        GeopyError: If Nominatim still fails after all retries.
     """
-    geolocator = Nominatim(user_agent=osm_email)
-    try:
-        location = geolocator.geocode(query)
-        if location is None:
-            return None
-        return {
+    cached = _get_cached_geocode("nominatim", query)
+    if cached is not _CACHE_MISS:
+        return cached
+    # The rate limiter re-raises errors, so None here is a confirmed "not found"
+    # that is safe to cache, and an outage never reaches the cache
+    location = await geocode(query)
+    result = (
+        None
+        if location is None
+        else {
             "lat": location.latitude,
             "lon": location.longitude,
             "address": location.address,
         }
-    except GeopyError as e:
-        logger.error(f"Nominatim error for query: {query}, error: {e}")
-        return None
+    )
+    _set_cached_geocode("nominatim", query, result)
+    return result
+
+
+def _rate_limited_nominatim(nominatim: Nominatim) -> Callable[..., Awaitable[Any]]:
+    """
+    Wraps Nominatim's geocode coroutine to follow its usage policy.
+
+    Errors are re-raised on the first failure rather than retried and turned into
+    None, so that `_nominatim_geocode`'s backoff owns the retries and callers can
+    tell an outage apart from a place that wasn't found.
+
+    Args:
+        nominatim (Nominatim): Nominatim geocoder running on an async adapter.
+
+    Returns:
+        Callable[..., Awaitable[Any]]: Rate-limited Nominatim geocode coroutine.
+    """
+    return AsyncRateLimiter(
+        nominatim.geocode,
+        min_delay_seconds=NOMINATIM_MIN_DELAY_SECONDS,
+        max_retries=0,
+        swallow_exceptions=False,
+    )
 
 
 # Add ArcGIS fallback geocoding
@@ -113,29 +467,51 @@ def _nominatim_geocode(query: str, osm_email: str) -> Optional[dict[str, Any]]:
     max_tries=5,
     max_time=60,
 )
-def _arcgis_geocode(query: str) -> Optional[dict[str, Any]]:
+async def _arcgis_geocode(query: str, geolocator: ArcGIS) -> dict[str, Any] | None:
     """
     Fallback geocoding using ArcGIS service with retry on errors.
 
     Args:
         query (str): The geocode query string.
+        geolocator (ArcGIS): ArcGIS geocoder running on an async adapter.
 
     Returns:
-        Optional[dict[str, Any]]: Geocoding result or None if not found.
+        dict[str, Any] | None: Geocoding result or None if not found.
     """
-    geolocator = ArcGIS()
+    cached = _get_cached_geocode("arcgis", query)
+    if cached is not _CACHE_MISS:
+        return cached
     try:
-        location = geolocator.geocode(query)
-        if location is None:
-            return None
-        return {
+        location = await geolocator.geocode(query)
+    except GeopyError as e:
+        logger.error(f"ArcGIS error for query: {query}, error: {e}")
+        return None
+    result = (
+        None
+        if location is None
+        else {
             "lat": location.latitude,
             "lon": location.longitude,
             "address": getattr(location, "address", ""),
         }
-    except GeopyError as e:
-        logger.error(f"ArcGIS error for query: {query}, error: {e}")
-        return None
+    )
+    _set_cached_geocode("arcgis", query, result)
+    return result
+
+
+def _is_weak_match(result: dict[str, Any]) -> bool:
+    """
+    Checks whether a Google Maps geocoding result is a low-confidence match.
+
+    Args:
+        result (dict[str, Any]): A single result from the Google Maps Geocoding API.
+
+    Returns:
+        bool: True if only part of the query matched or the location is approximate.
+    """
+    return bool(result.get("partial_match")) or (
+        result.get("geometry", {}).get("location_type") == "APPROXIMATE"
+    )
 
 
 def is_dms(coord: str) -> bool:
@@ -151,117 +527,322 @@ def is_dms(coord: str) -> bool:
     Returns:
         bool: True if the coordinate is in valid DMS format, False otherwise.
     """
-    # Regex breakdown:
-    #  - Degrees: 1–3 digits (00 to 180 for lon, 00 to 90 for lat but we won't strictly enforce ranges here)
-    #  - Minutes: exactly 2 digits (00 to 59)
-    #  - Seconds: 2 digits plus optional fraction (00.0 to 59.999...)
-    #  - Direction: one of N, S, E, or W
-    dms_pattern = re.compile(
-        r"""
-        ^\s*                                  # optional leading whitespace
-        ([0-9]{1,3})°([0-5][0-9])'(\d{2}(?:\.\d+)?)"  # latitude DMS
-        \s*([NS])                             # N or S
-        [,\s]+                                # separator (comma and/or space)
-        ([0-9]{1,3})°([0-5][0-9])'(\d{2}(?:\.\d+)?)"  # longitude DMS
-        \s*([EW])                             # E or W
-        \s*$                                  # optional trailing whitespace
-    """,
-        re.VERBOSE | re.IGNORECASE,
+    return bool(_DMS_PATTERN.match(coord))
+
+
+def parse_dms(coord: str) -> tuple[float, float]:
+    """
+    Converts a DMS latitude and longitude string to decimal degrees.
+
+    Args:
+        coord (str): Coordinate string in DMS format, as accepted by `is_dms`.
+
+    Returns:
+        tuple[float, float]: Latitude and longitude, negative to the south and west.
+
+    Raises:
+        ValueError: If `coord` is not in DMS format.
+    """
+    match = _DMS_PATTERN.match(coord)
+    if match is None:
+        raise ValueError(f"Not a DMS coordinate: {coord}")
+    lat_deg, lat_min, lat_sec, lat_dir, lon_deg, lon_min, lon_sec, lon_dir = (
+        match.groups()
     )
+    lat = int(lat_deg) + int(lat_min) / 60 + float(lat_sec) / 3600
+    lon = int(lon_deg) + int(lon_min) / 60 + float(lon_sec) / 3600
+    if lat_dir.upper() == "S":
+        lat = -lat
+    if lon_dir.upper() == "W":
+        lon = -lon
+    return lat, lon
 
-    return bool(dms_pattern.match(coord))
 
+def _parse_title_coordinates(title: str) -> tuple[float, float] | None:
+    """
+    Reads coordinates from a title that is a DMS or decimal "lat, lon" position.
 
-def geocode_places(
-    rows: list[dict[str, str]], gmaps_client: Any, osm_email: str
+    Args:
+        title (str): Title of a saved place.
+
+    Returns:
+        tuple[float, float] | None: Latitude and longitude, or None if the title
+            isn't a position.
+
+    Raises:
+        ValueError: If the title is a position, but out of the valid range.
+    """
+    if is_dms(title):
+        lat, lon = parse_dms(title)
+    else:
+        match = _DECIMAL_COORDS_PATTERN.match(title)
+        if match is None:
+            return None
+        lat, lon = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Out of range coordinates in title: {title}")
+    return lat, lon
+
+
+async def _geocode_row(
+    row: dict[str, str],
+    session: aiohttp.ClientSession,
+    api_key: str,
+    rate_limiter: _RateLimiter,
+    nominatim_geocode: Callable[..., Awaitable[Any]],
+    nominatim_breaker: _CircuitBreaker,
+    arcgis: ArcGIS,
+) -> dict[str, Any] | None:
+    """
+    Geocodes a single saved place row, falling back from Google Maps to Nominatim and ArcGIS.
+
+    Args:
+        row (dict[str, str]): CSV row with 'Title' and 'URL' fields.
+        session (aiohttp.ClientSession): HTTP session shared by all Google Maps requests.
+        api_key (str): Google Maps API key.
+        rate_limiter (_RateLimiter): Limiter shared by all Google Maps requests.
+        nominatim_geocode (Callable[..., Awaitable[Any]]): Rate-limited Nominatim geocode coroutine.
+        nominatim_breaker (_CircuitBreaker): Breaker shared by all rows of the run, to stop calling Nominatim when it is down.
+        arcgis (ArcGIS): ArcGIS geocoder running on an async adapter.
+
+    Returns:
+        dict[str, Any] | None: GeoJSON Point feature for the row, or None if it could not be geocoded.
+    """
+    title = row.get("Title", "")
+    if not title:
+        logger.warning("Missing title for row: {row}", row=row)
+        return None
+    url = row.get("URL", "")
+    if not url:
+        logger.warning("Missing URL for row: {row}", row=row)
+        return None
+    try:
+        # The title alone is the query most likely to match (with backoff)
+        results = await _geocode_with_retry(title, session, api_key, rate_limiter)
+        if not results or _is_weak_match(results[0]):
+            # Only spend a second request on the URL when the title didn't
+            # resolve confidently
+            url_results = await _geocode_with_retry(url, session, api_key, rate_limiter)
+            # A raw Maps URL often only matches loosely, so only let it replace
+            # a weak title match when it resolved confidently itself
+            if url_results and (not results or not _is_weak_match(url_results[0])):
+                results = url_results
+        if results:
+            # Process the Google Maps results
+            first_result = results[0]
+            loc = first_result.get("geometry", {}).get("location", {})
+            lat = loc.get("lat")
+            lon = loc.get("lng")
+            if lat is None or lon is None:
+                logger.warning(
+                    "Incomplete location data for title: {title}", title=title
+                )
+                return None
+            formatted_address = first_result.get("formatted_address", "")
+            categories = first_result.get("types", [])
+        else:
+            nom_res = None
+            if not nominatim_breaker.is_open:
+                try:
+                    # Fallback to Nominatim if Google Maps returns no results
+                    nom_res = await _nominatim_geocode(title, nominatim_geocode)
+                    nominatim_breaker.record_success()
+                except GeopyError as e:
+                    logger.error(f"Nominatim error for query: {title}, error: {e}")
+                    nominatim_breaker.record_failure()
+            if nom_res:
+                lat = nom_res["lat"]
+                lon = nom_res["lon"]
+                formatted_address = nom_res.get("address", "")
+            else:
+                # Fallback to ArcGIS if Nominatim fails
+                arc_res = await _arcgis_geocode(title, arcgis)
+                if arc_res:
+                    lat = arc_res["lat"]
+                    lon = arc_res["lon"]
+                    formatted_address = arc_res.get("address", "")
+                else:
+                    logger.warning(
+                        f"Fallback ArcGIS returned no results for title: {title}"
+                    )
+                    # Skip this row if no geocoding result
+                    return None
+            categories = []
+        if formatted_address:
+            title = f"{title} | {formatted_address}"
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {
+                "location": {"name": title},
+                "url": url,
+                "categories": categories,
+            },
+        }
+    except Exception as e:
+        logger.error(
+            "Google Maps API error for title: {title}, error: {error}",
+            title=title,
+            error=str(e),
+        )
+        return None
+
+
+async def geocode_places_async(
+    rows: list[dict[str, str]],
+    api_key: str,
+    osm_email: str,
+    rps: float = GEOCODE_RATE_LIMIT_RPS,
+    concurrency: int = GEOCODE_CONCURRENCY,
 ) -> dict[str, Any]:
     """
-    Uses a Google Maps client to geocode place titles and returns a GeoJSON FeatureCollection.
+    Geocodes place titles concurrently and returns a GeoJSON FeatureCollection.
+
+    Up to `concurrency` rows are in flight at once, Google Maps requests are started
+    at no more than `rps` per second and share one pool of keep-alive connections,
+    each geocoder is created once per run, and Nominatim calls are rate limited to
+    its usage policy. Rows with the same title and URL are only geocoded once, and
+    rows whose title already is a DMS or decimal "lat, lon" position aren't sent to
+    any API (and are skipped if that position is out of range).
+
+    There is no batching: Google's Geocoding API only takes one address per request,
+    and ArcGIS batch geocoding needs an authenticated account. Keep-alive connections
+    already avoid a new TCP + TLS handshake per request.
 
     Args:
         rows (list[dict]): List of CSV rows with 'Title' and 'URL' fields.
-        gmaps_client (googlemaps.Client): Authenticated Google Maps client.
+        api_key (str): Google Maps API key.
         osm_email (str): Email address for Nominatim usage policy compliance.
+        rps (float): Maximum number of Google Maps requests started per second.
+        concurrency (int): Maximum number of rows being geocoded at the same time.
 
     Returns:
-        dict: GeoJSON FeatureCollection of geocoded points.
+        dict: GeoJSON FeatureCollection of geocoded points, in the same order as `rows`.
     """
-    features: list[dict] = []
-    for row in tqdm(rows, desc="Geocoding places"):
-        title = row.get("Title", "")
-        if not title:
-            logger.warning("Missing title for row: {row}", row=row)
+    # Read coordinate titles (e.g. dropped pins) in one pass up front, so they
+    # never get a geocoding task or a deduplication entry
+    title_coordinates: list[tuple[float, float] | None] = []
+    # Invalid positions would only produce bogus free-text geocoding hits
+    skipped_rows: set[int] = set()
+    for position, row in enumerate(rows):
+        try:
+            title_coordinates.append(_parse_title_coordinates(row.get("Title", "")))
+        except ValueError as e:
+            logger.warning("Skipping row: {error}", error=str(e))
+            title_coordinates.append(None)
+            skipped_rows.add(position)
+
+    # Geocode each distinct (title, URL) pair only once
+    row_keys = [(row.get("Title", ""), row.get("URL", "")) for row in rows]
+    unique_rows: dict[tuple[str, str], dict[str, str]] = {}
+    for position, (row_key, row, coordinates) in enumerate(
+        zip(row_keys, rows, title_coordinates)
+    ):
+        if coordinates is None and position not in skipped_rows:
+            unique_rows.setdefault(row_key, row)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = _RateLimiter(rps)
+    # The shared session already reuses keep-alive connections; cap them at one per
+    # concurrent row and cache DNS lookups longer than aiohttp's 10 s default
+    connector = aiohttp.TCPConnector(
+        limit_per_host=concurrency, ttl_dns_cache=DNS_CACHE_TTL_SECONDS
+    )
+    async with (
+        aiohttp.ClientSession(connector=connector) as session,
+        Nominatim(user_agent=osm_email, adapter_factory=AioHTTPAdapter) as nominatim,
+        ArcGIS(adapter_factory=AioHTTPAdapter) as arcgis,
+    ):
+        nominatim_geocode = _rate_limited_nominatim(nominatim)
+        nominatim_breaker = _CircuitBreaker(
+            "Nominatim", NOMINATIM_MAX_CONSECUTIVE_FAILURES
+        )
+
+        async def process(
+            index: int, row: dict[str, str]
+        ) -> tuple[int, dict[str, Any] | None]:
+            async with semaphore:
+                return index, await _geocode_row(
+                    row,
+                    session,
+                    api_key,
+                    rate_limiter,
+                    nominatim_geocode,
+                    nominatim_breaker,
+                    arcgis,
+                )
+
+        logger.info(
+            "Geocoding {count} unique places out of {total} rows",
+            count=len(unique_rows),
+            total=len(rows),
+        )
+        # Collect results as they complete to report progress, putting each one
+        # back in its row's slot through the index it was tagged with
+        results: list[dict[str, Any] | None] = [None] * len(unique_rows)
+        tasks = [process(index, row) for index, row in enumerate(unique_rows.values())]
+        for next_result in tqdm(
+            asyncio.as_completed(tasks), total=len(tasks), desc="Geocoding places"
+        ):
+            index, feature = await next_result
+            results[index] = feature
+
+    # Fan the results back out to every row, giving duplicates their own feature dict
+    feature_by_key = dict(zip(unique_rows, results))
+    features: list[dict[str, Any]] = []
+    emitted_keys: set[tuple[str, str]] = set()
+    for position, (row, row_key, coordinates) in enumerate(
+        zip(rows, row_keys, title_coordinates)
+    ):
+        if position in skipped_rows:
             continue
-        elif is_dms(title):
-            # Skip DMS coordinates
-            logger.warning("Skipping DMS coordinates in title: {title}", title=title)
+        if coordinates is not None:
+            lat, lon = coordinates
+            features.append(
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                    "properties": {
+                        "location": {"name": row["Title"]},
+                        "url": row.get("URL", ""),
+                        "categories": [],
+                    },
+                }
+            )
             continue
-        url = row.get("URL", "")
-        if not url:
-            logger.warning("Missing URL for row: {row}", row=row)
+        feature = feature_by_key[row_key]
+        if feature is None:
             continue
-        try:
-            # Including the URL in the geocode query to improve accuracy (with backoff)
-            results = _geocode_with_retry(f"{title} {url}", gmaps_client)
-            if not results:
-                # Let's try without the URL
-                results = _geocode_with_retry(title, gmaps_client)
-            if not results:
-                # Let's try with just the URL
-                results = _geocode_with_retry(url, gmaps_client)
-            if results:
-                # Process the Google Maps results
-                first_result = results[0]
-                loc = first_result.get("geometry", {}).get("location", {})
-                lat = loc.get("lat")
-                lon = loc.get("lng")
-                if lat is None or lon is None:
-                    logger.warning(
-                        "Incomplete location data for title: {title}", title=title
-                    )
-                    continue
-                formatted_address = first_result.get("formatted_address", "")
-                categories = first_result.get("types", [])
-            else:
-                try:
-                    # Fallback to Nominatim if Google Maps returns no results
-                    nom_res = _nominatim_geocode(title, osm_email)
-                except:
-                    nom_res = None
-                if nom_res:
-                    lat = nom_res["lat"]
-                    lon = nom_res["lon"]
-                    formatted_address = nom_res.get("address", "")
-                else:
-                    # Fallback to ArcGIS if Nominatim fails
-                    arc_res = _arcgis_geocode(title)
-                    if arc_res:
-                        lat = arc_res["lat"]
-                        lon = arc_res["lon"]
-                        formatted_address = arc_res.get("address", "")
-                    else:
-                        logger.warning(
-                            f"Fallback ArcGIS returned no results for title: {title}"
-                        )
-                        # Skip this row if no geocoding result
-                        continue
-                categories = []
-            if formatted_address:
-                title = f"{title} | {formatted_address}"
-            feature = {
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": [lon, lat]},
-                "properties": {
-                    "location": {"name": title},
-                    "url": url,
-                    "categories": categories,
-                },
-            }
-            features.append(feature)
-        except Exception as e:
-            logger.error(
-                "Google Maps API error for title: {title}, error: {error}",
-                title=title,
-                error=str(e),
-            )
+        features.append(copy.deepcopy(feature) if row_key in emitted_keys else feature)
+        emitted_keys.add(row_key)
+    logger.success(
+        "Geocoded {count} of {total} places", count=len(features), total=len(rows)
+    )
     return {"type": "FeatureCollection", "features": features}
+
+
+def geocode_places(
+    rows: list[dict[str, str]],
+    api_key: str,
+    osm_email: str,
+    rps: float = GEOCODE_RATE_LIMIT_RPS,
+    concurrency: int = GEOCODE_CONCURRENCY,
+) -> dict[str, Any]:
+    """
+    Geocodes place titles and returns a GeoJSON FeatureCollection.
+
+    Synchronous entry point running `geocode_places_async` on a new event loop.
+
+    Args:
+        rows (list[dict]): List of CSV rows with 'Title' and 'URL' fields.
+        api_key (str): Google Maps API key.
+        osm_email (str): Email address for Nominatim usage policy compliance.
+        rps (float): Maximum number of Google Maps requests started per second.
+        concurrency (int): Maximum number of rows being geocoded at the same time.
+
+    Returns:
+        dict: GeoJSON FeatureCollection of geocoded points, in the same order as `rows`.
+    """
+    return asyncio.run(
+        geocode_places_async(rows, api_key, osm_email, rps=rps, concurrency=concurrency)
+    )
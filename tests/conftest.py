@@ -0,0 +1,18 @@
+import diskcache
+import pytest
+from google_maps_list_filter import description_generator, map_utils
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """
+    Point the persistent caches at a temporary directory instead of the home directory.
+    """
+    monkeypatch.setattr(
+        map_utils, "_geocode_cache", diskcache.Cache(tmp_path / "geocode_cache")
+    )
+    monkeypatch.setattr(
+        description_generator,
+        "_description_cache",
+        diskcache.Cache(tmp_path / "description_cache"),
+    )
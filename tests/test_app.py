@@ -0,0 +1,58 @@
+import csv
+import io
+
+from google_maps_list_filter.app import build_mymaps_csv
+
+
+def test_build_mymaps_csv():
+    """
+    Test the My Maps CSV header, quoting, categories and WKT, skipping non-Point features.
+    """
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [2.5, 1.25]},
+                "properties": {
+                    "location": {"name": 'Cafe "Central", Vienna'},
+                    "description": "A coffee house.",
+                    "categories": ["cafe", "food"],
+                },
+            },
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+                "properties": {"location": {"name": "Route"}},
+            },
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [-74.0, 40.5, 10.0]},
+                "properties": {
+                    "location": {"name": "Park"},
+                    "title": "Central Park",
+                },
+            },
+        ],
+    }
+    csv_text = build_mymaps_csv(geojson)
+    lines = csv_text.splitlines()
+    assert lines[0] == "name,description,categories,WKT"
+    assert lines[1] == (
+        '"Cafe ""Central"", Vienna",A coffee house.,"cafe, food",POINT(2.5 1.25)'
+    )
+    rows = list(csv.DictReader(io.StringIO(csv_text)))
+    assert rows == [
+        {
+            "name": 'Cafe "Central", Vienna',
+            "description": "A coffee house.",
+            "categories": "cafe, food",
+            "WKT": "POINT(2.5 1.25)",
+        },
+        {
+            "name": "Central Park",
+            "description": "",
+            "categories": "",
+            "WKT": "POINT(-74.0 40.5)",
+        },
+    ]
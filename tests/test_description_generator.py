@@ -1,6 +1,14 @@
+import json
+from types import SimpleNamespace
+
 import pytest
+from google_maps_list_filter import description_generator
 from google_maps_list_filter.description_generator import (
     PlaceDescription,
+    _build_response_format,
+    _description_cache_key,
+    generate_place_description,
+    generate_place_descriptions_batch,
 )
 
 
@@ -17,3 +25,253 @@ def test_place_description_model_valid():
     assert model.title == data["title"]
     assert model.categories == data["categories"]
     assert model.description == data["description"]
+
+
+def test_description_cache_key_ignores_category_order():
+    """
+    Test that the cache key does not depend on the order of the categories.
+    """
+    key_a = _description_cache_key("Cafe", ["cafe", "food"], "model", "prompt")
+    key_b = _description_cache_key("Cafe", ["food", "cafe"], "model", "prompt")
+    assert key_a == key_b
+    assert key_a != _description_cache_key("Cafe", ["cafe"], "other", "prompt")
+
+
+def test_generate_place_description_returns_cached_result():
+    """
+    Test that a cached description is returned without calling the OpenAI API.
+    """
+    cache = description_generator._get_description_cache()
+    expected = PlaceDescription(
+        title="Central Park", categories=["park"], description="A park."
+    )
+    model = "gpt-4o-mini-search-preview"
+    system_prompt = "prompt"
+    cache[_description_cache_key("Central Park", ["park"], model, system_prompt)] = (
+        expected.model_dump()
+    )
+    result = generate_place_description(
+        "Central Park",
+        ["park"],
+        "invalid-key",
+        model=model,
+        system_prompt=system_prompt,
+    )
+    assert result == expected
+
+
+def test_generate_place_descriptions_batch_skips_batch_when_all_cached():
+    """
+    Test that no batch is submitted when every place is already cached.
+    """
+    cache = description_generator._get_description_cache()
+    places = [("Central Park", ["park"]), ("Louvre", ["museum"])]
+    expected = [
+        PlaceDescription(
+            title="Central Park", categories=["park"], description="A park."
+        ),
+        PlaceDescription(
+            title="Louvre", categories=["museum"], description="A museum."
+        ),
+    ]
+    for (title, categories), description in zip(places, expected):
+        key = _description_cache_key(
+            title,
+            categories,
+            description_generator.DEFAULT_BATCH_MODEL,
+            description_generator.DEFAULT_SYSTEM_PROMPT,
+        )
+        cache[key] = description.model_dump()
+    result = generate_place_descriptions_batch(places, "invalid-key")
+    assert result == expected
+
+
+def test_description_cache_opened_lazily_in_configured_dir(tmp_path, monkeypatch):
+    """
+    Test that the description cache is only opened when used, in the configured directory.
+    """
+    monkeypatch.setattr(description_generator, "_description_cache", None)
+    cache_dir = tmp_path / "custom_description_cache"
+    monkeypatch.setenv(description_generator.DESCRIPTION_CACHE_DIR_ENV, str(cache_dir))
+    assert not cache_dir.exists()
+    description_generator._get_description_cache()["key"] = "value"
+    assert cache_dir.is_dir()
+
+
+def test_build_response_format_is_strict_json_schema():
+    """
+    Test that the response format is a strict JSON schema requiring every field.
+    """
+    response_format = _build_response_format()
+    assert response_format["type"] == "json_schema"
+    json_schema = response_format["json_schema"]
+    assert json_schema["name"] == "PlaceDescription"
+    assert json_schema["strict"] is True
+    assert json_schema["schema"]["additionalProperties"] is False
+    assert set(json_schema["schema"]["required"]) == {
+        "title",
+        "categories",
+        "description",
+    }
+
+
+class FakeBatchClient:
+    """
+    Minimal stand-in for the OpenAI client's files and batches APIs.
+    """
+
+    def __init__(self, statuses, output_lines=()):
+        self.statuses = list(statuses)
+        self.output_lines = list(output_lines)
+        self.uploaded_lines = None
+        self.created_batches = 0
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve
+        )
+
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded_lines = [
+            json.loads(line) for line in file[1].decode().splitlines()
+        ]
+        return SimpleNamespace(id="file-in")
+
+    def _content(self, file_id):
+        assert file_id == "file-out"
+        return SimpleNamespace(
+            text="\n".join(json.dumps(line) for line in self.output_lines)
+        )
+
+    def _batch(self):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        output_file_id = "file-out" if status == "completed" else None
+        return SimpleNamespace(
+            id="batch-1", status=status, output_file_id=output_file_id
+        )
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        self.created_batches += 1
+        return self._batch()
+
+    def _retrieve(self, batch_id):
+        assert batch_id == "batch-1"
+        return self._batch()
+
+
+def test_generate_place_descriptions_batch_maps_results_by_custom_id(monkeypatch):
+    """
+    Test the JSONL requests, the mapping of results to places and failed lines.
+    """
+    places = [
+        ("Central Park", ["park"]),
+        ("Louvre", ["museum"]),
+        ("Central Park", ["park"]),
+    ]
+    model = description_generator.DEFAULT_BATCH_MODEL
+    system_prompt = description_generator.DEFAULT_SYSTEM_PROMPT
+    park_key = _description_cache_key("Central Park", ["park"], model, system_prompt)
+    louvre_key = _description_cache_key("Louvre", ["museum"], model, system_prompt)
+    park = PlaceDescription(
+        title="Central Park", categories=["park"], description="A park."
+    )
+    client = FakeBatchClient(
+        ["in_progress", "completed"],
+        [
+            {
+                "custom_id": park_key,
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"content": park.model_dump_json()}}]
+                    },
+                },
+            },
+            {
+                "custom_id": louvre_key,
+                "response": None,
+                "error": {"code": "server_error", "message": "Failed"},
+            },
+        ],
+    )
+    monkeypatch.setattr(description_generator.openai, "Client", lambda api_key: client)
+
+    result = generate_place_descriptions_batch(
+        places, "fake-key", poll_interval_seconds=0
+    )
+
+    # Duplicate places share a single request, identified by their cache key
+    assert [line["custom_id"] for line in client.uploaded_lines] == [
+        park_key,
+        louvre_key,
+    ]
+    body = client.uploaded_lines[0]["body"]
+    assert body["model"] == model
+    assert "web_search_options" not in body
+    assert body["response_format"]["type"] == "json_schema"
+    assert result == [park, None, park]
+    cache = description_generator._get_description_cache()
+    assert cache[park_key] == park.model_dump()
+    assert louvre_key not in cache
+
+
+def test_generate_place_descriptions_batch_resumes_after_timeout(monkeypatch):
+    """
+    Test that a batch still running at the deadline is picked up by the next call.
+    """
+    places = [("Louvre", ["museum"])]
+    louvre = PlaceDescription(
+        title="Louvre", categories=["museum"], description="A museum."
+    )
+    louvre_key = _description_cache_key(
+        "Louvre",
+        ["museum"],
+        description_generator.DEFAULT_BATCH_MODEL,
+        description_generator.DEFAULT_SYSTEM_PROMPT,
+    )
+    client = FakeBatchClient(["in_progress"])
+    monkeypatch.setattr(description_generator.openai, "Client", lambda api_key: client)
+    with pytest.raises(TimeoutError):
+        generate_place_descriptions_batch(places, "fake-key", max_wait_seconds=0)
+
+    client.statuses = ["completed"]
+    client.output_lines = [
+        {
+            "custom_id": louvre_key,
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"message": {"content": louvre.model_dump_json()}}]
+                },
+            },
+        }
+    ]
+    result = generate_place_descriptions_batch(places, "fake-key", max_wait_seconds=0)
+    assert result == [louvre]
+    assert client.created_batches == 1
+
+
+def test_generate_place_description_raises_instead_of_returning_none(monkeypatch):
+    """
+    Test that a refusal is retried and raised rather than returned or cached as None.
+    """
+    calls = []
+
+    def parse(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(parsed=None, refusal="I can't help with that.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(
+        beta=SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(parse=parse))
+        )
+    )
+    monkeypatch.setattr(description_generator.openai, "Client", lambda api_key: client)
+    monkeypatch.setattr(
+        description_generator.backoff._sync.time, "sleep", lambda s: None
+    )
+    with pytest.raises(ValueError, match="refusal"):
+        generate_place_description("Central Park", ["park"], "key")
+    assert len(calls) == 5
+    assert len(description_generator._get_description_cache()) == 0
@@ -3,7 +3,13 @@ import json
 import zipfile
 from pathlib import Path
 
-from google_maps_list_filter.io_utils import extract_saved_places_json, load_geojson
+from google_maps_list_filter.io_utils import (
+    extract_saved_places_json,
+    extract_zip,
+    list_saved_csvs,
+    load_geojson,
+    read_saved_csv,
+)
 
 
 def test_load_geojson(tmp_path):
@@ -47,3 +53,72 @@ def test_extract_saved_places_json_not_found(tmp_path):
         z.writestr("other_file.txt", "data")
     with pytest.raises(FileNotFoundError):
         extract_saved_places_json(str(zip_path), str(tmp_path))
+
+
+def test_read_saved_csv_keeps_empty_cells_as_strings(tmp_path):
+    """
+    Test that CSV rows are returned as string dicts, with empty cells as empty strings.
+    """
+    csv_file = tmp_path / "Favourites.csv"
+    csv_file.write_text(
+        'Title,Note,URL\n,,\nCafe "Central",,https://maps.google.com/?cid=1\n'
+    )
+    rows = read_saved_csv(str(csv_file))
+    assert rows == [
+        {"Title": "", "Note": "", "URL": ""},
+        {
+            "Title": 'Cafe "Central"',
+            "Note": "",
+            "URL": "https://maps.google.com/?cid=1",
+        },
+    ]
+
+
+def test_read_saved_csv_falls_back_on_irregular_files(tmp_path):
+    """
+    Test that empty files and rows with extra fields are read instead of raising.
+    """
+    empty_file = tmp_path / "Empty.csv"
+    empty_file.write_text("")
+    assert read_saved_csv(str(empty_file)) == []
+
+    ragged_file = tmp_path / "Ragged.csv"
+    ragged_file.write_text("Title,URL\nCafe,https://maps.google.com/?cid=1,extra\n")
+    rows = read_saved_csv(str(ragged_file))
+    assert len(rows) == 1
+    assert rows[0]["Title"] == "Cafe"
+    assert rows[0]["URL"] == "https://maps.google.com/?cid=1"
+
+
+def test_extract_zip_only_extracts_saved_csvs(tmp_path):
+    """
+    Test that only CSVs inside 'Saved' folders are extracted from the ZIP archive.
+    """
+    zip_path = tmp_path / "takeout.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        z.writestr("Takeout/Saved/Favourites.csv", "Title,URL\n")
+        z.writestr("Takeout/Saved/notes.txt", "data")
+        z.writestr("Takeout/Photos/photo.csv", "data")
+    output_dir = tmp_path / "output"
+    extract_zip(str(zip_path), str(output_dir))
+    extracted = sorted(
+        p.relative_to(output_dir).as_posix()
+        for p in output_dir.rglob("*")
+        if p.is_file()
+    )
+    assert extracted == ["Takeout/Saved/Favourites.csv"]
+
+
+def test_list_saved_csvs_skips_ignored_folders(tmp_path):
+    """
+    Test that only CSVs in 'Saved' folders outside ignored Takeout folders are listed.
+    """
+    saved = tmp_path / "Takeout" / "Saved"
+    saved.mkdir(parents=True)
+    (saved / "Favourites.csv").write_text("Title,URL\n")
+    (saved / "notes.txt").write_text("data")
+    ignored = tmp_path / "Takeout" / "Google Photos" / "Saved"
+    ignored.mkdir(parents=True)
+    (ignored / "photos.csv").write_text("data")
+
+    assert list_saved_csvs(str(tmp_path)) == [str(saved / "Favourites.csv")]
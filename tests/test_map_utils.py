@@ -1,5 +1,23 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+import aiohttp
 import pytest
-from google_maps_list_filter.map_utils import filter_geojson_by_geometry
+from geopy.exc import GeocoderUnavailable, GeopyError
+from loguru import logger
+from google_maps_list_filter import map_utils
+from google_maps_list_filter.map_utils import (
+    build_point_tree,
+    extract_point_coordinates,
+    filter_geojson_by_geometries,
+    filter_geojson_by_geometry,
+    geocode_places,
+    geocode_places_async,
+    is_dms,
+    parse_dms,
+)
 
 
 def make_feature(coord, name="place"):
@@ -10,6 +28,34 @@ def make_feature(coord, name="place"):
     }
 
 
+@pytest.fixture
+def geocoded_titles(monkeypatch):
+    """
+    Replace row geocoding with a stub, returning the titles it was called with.
+    """
+    titles = []
+
+    async def fake_geocode_row(row, *args):
+        titles.append(row["Title"])
+        return make_feature([1, 2], name=row["Title"])
+
+    monkeypatch.setattr(map_utils, "_geocode_row", fake_geocode_row)
+    return titles
+
+
+@pytest.fixture
+def no_geocode_delays(monkeypatch):
+    """
+    Skip the backoff and Nominatim rate limiter delays.
+    """
+
+    async def no_sleep(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(map_utils, "NOMINATIM_MIN_DELAY_SECONDS", 0.0)
+
+
 def test_filter_geojson_by_geometry_valid():
     """
     Test filtering features by a simple square polygon geometry.
@@ -64,3 +110,492 @@ def test_filter_geojson_by_geometry_invalid_geometry():
     places_geojson = {"type": "FeatureCollection", "features": []}
     with pytest.raises(ValueError):
         filter_geojson_by_geometry(places_geojson, invalid_geom)
+
+
+def test_filter_geojson_by_geometries_multiple_polygons():
+    """
+    Test that each polygon gets its own FeatureCollection, in input order.
+    """
+    left = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]],
+    }
+    right = {
+        "type": "Polygon",
+        "coordinates": [[[20, 0], [20, 10], [30, 10], [30, 0], [20, 0]]],
+    }
+    features = [
+        make_feature([25, 5], name="right1"),
+        make_feature([5, 5], name="left"),
+        make_feature([15, 5], name="outside"),
+        make_feature([21, 1], name="right2"),
+    ]
+    places_geojson = {"type": "FeatureCollection", "features": features}
+
+    left_result, right_result = filter_geojson_by_geometries(
+        places_geojson, [left, right]
+    )
+    assert left_result["features"] == [features[1]]
+    assert right_result["features"] == [features[0], features[3]]
+
+
+def test_extract_point_coordinates_skips_non_point_features():
+    """
+    Test that only Point features are returned, aligned with their coordinate arrays.
+    """
+    point = make_feature([1.5, 2.5], name="point")
+    line = {
+        "type": "Feature",
+        "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+        "properties": {"location": {"name": "line"}},
+    }
+    no_geometry = {"type": "Feature", "geometry": None, "properties": {}}
+    places_geojson = {
+        "type": "FeatureCollection",
+        "features": [line, point, no_geometry],
+    }
+
+    features, lons, lats = extract_point_coordinates(places_geojson)
+    assert features == [point]
+    assert lons.tolist() == [1.5]
+    assert lats.tolist() == [2.5]
+
+
+def test_extract_point_coordinates_ignores_altitude():
+    """
+    Test that a third (altitude) coordinate does not shift the longitude/latitude arrays.
+    """
+    places_geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            make_feature([1.0, 2.0, 100.0], name="with_altitude"),
+            make_feature([3.0, 4.0], name="without_altitude"),
+        ],
+    }
+
+    _, lons, lats = extract_point_coordinates(places_geojson)
+    assert lons.tolist() == [1.0, 3.0]
+    assert lats.tolist() == [2.0, 4.0]
+
+
+def test_filter_geojson_by_geometry_with_precomputed_coordinates():
+    """
+    Test filtering with coordinates extracted ahead of time.
+    """
+    filter_geom = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]],
+    }
+    inside = make_feature([5, 5], name="inside")
+    outside = make_feature([-5, 5], name="outside")
+    places_geojson = {"type": "FeatureCollection", "features": [inside, outside]}
+    point_coordinates = extract_point_coordinates(places_geojson)
+
+    result = filter_geojson_by_geometry(places_geojson, filter_geom, point_coordinates)
+    assert result["features"] == [inside]
+
+
+def test_filter_geojson_by_geometry_with_point_tree():
+    """
+    Test that filtering through a spatial index keeps the matching features in order.
+    """
+    filter_geom = {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]],
+    }
+    features = [
+        make_feature([9, 9], name="inside1"),
+        make_feature([15, 5], name="outside"),
+        make_feature([1, 1], name="inside2"),
+    ]
+    places_geojson = {"type": "FeatureCollection", "features": features}
+    point_coordinates = extract_point_coordinates(places_geojson)
+    point_tree = build_point_tree(point_coordinates[1], point_coordinates[2])
+
+    result = filter_geojson_by_geometry(
+        places_geojson, filter_geom, point_coordinates, point_tree
+    )
+    names = [feat["properties"]["location"]["name"] for feat in result["features"]]
+    assert names == ["inside1", "inside2"]
+
+
+def test_geocode_places_async_skips_unusable_rows():
+    """
+    Test that rows without a title or without a URL are skipped.
+    """
+    rows = [
+        {"Title": "", "URL": "https://maps.google.com/?cid=1"},
+        {"Title": "Some place", "URL": ""},
+    ]
+    result = asyncio.run(geocode_places_async(rows, "fake-key", "test@example.com"))
+    assert result == {"type": "FeatureCollection", "features": []}
+
+
+def test_geocode_places_async_geocodes_duplicates_once(geocoded_titles):
+    """
+    Test that rows with the same title and URL are geocoded once but all kept.
+    """
+    rows = [
+        {"Title": "Cafe", "URL": "https://maps.google.com/?cid=1"},
+        {"Title": "Museum", "URL": "https://maps.google.com/?cid=2"},
+        {"Title": "Cafe", "URL": "https://maps.google.com/?cid=1"},
+    ]
+    result = asyncio.run(geocode_places_async(rows, "fake-key", "test@example.com"))
+    names = [feat["properties"]["location"]["name"] for feat in result["features"]]
+    assert sorted(geocoded_titles) == ["Cafe", "Museum"]
+    assert names == ["Cafe", "Museum", "Cafe"]
+    assert result["features"][0] is not result["features"][2]
+
+
+def test_is_dms():
+    """
+    Test that DMS coordinate strings are recognized and place names are not.
+    """
+    assert is_dms("4°41'02.9\"N 74°02'54.5\"W")
+    assert is_dms("04°41'02.90\" s, 074°02'54.50\" E")
+    assert not is_dms("Cafe Central")
+
+
+def test_geocode_places_sync_wrapper(geocoded_titles):
+    """
+    Test that the synchronous wrapper runs the async geocoder to completion.
+    """
+    rows = [{"Title": "Cafe", "URL": "https://maps.google.com/?cid=1"}]
+    result = geocode_places(rows, "fake-key", "test@example.com", rps=5, concurrency=2)
+    assert [feat["properties"]["location"]["name"] for feat in result["features"]] == [
+        "Cafe"
+    ]
+
+
+def test_rate_limiter_spaces_out_requests():
+    """
+    Test that concurrent waiters are released one interval apart.
+    """
+
+    async def run():
+        limiter = map_utils._RateLimiter(rps=20)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        release_times = []
+
+        async def acquire():
+            await limiter.wait()
+            release_times.append(loop.time() - start)
+
+        await asyncio.gather(*[acquire() for _ in range(3)])
+        return sorted(release_times)
+
+    release_times = asyncio.run(run())
+    assert release_times[0] < 0.05
+    assert release_times[2] >= 0.09
+
+
+def test_geocode_cache_shared_by_normalized_queries(monkeypatch):
+    """
+    Test that queries differing only in case and whitespace hit the same cache entry.
+    """
+    monkeypatch.delenv(map_utils.GEOCODE_CACHE_DISABLE_ENV, raising=False)
+    queries = []
+
+    async def fake_geocode(query):
+        queries.append(query)
+        return SimpleNamespace(latitude=1.0, longitude=2.0, address="Somewhere")
+
+    first = asyncio.run(map_utils._nominatim_geocode("Cafe  Central", fake_geocode))
+    second = asyncio.run(map_utils._nominatim_geocode(" cafe central ", fake_geocode))
+    assert queries == ["Cafe  Central"]
+    assert first == second == {"lat": 1.0, "lon": 2.0, "address": "Somewhere"}
+
+
+def test_geocode_cache_skips_nominatim_errors(monkeypatch, no_geocode_delays):
+    """
+    Test that only confirmed "not found" answers are cached, never outages.
+    """
+    cache = map_utils._get_geocode_cache()
+    monkeypatch.delenv(map_utils.GEOCODE_CACHE_DISABLE_ENV, raising=False)
+
+    async def unavailable_geocode(query):
+        raise GeocoderUnavailable("Service unavailable")
+
+    async def not_found_geocode(query):
+        return None
+
+    unavailable = map_utils._rate_limited_nominatim(
+        SimpleNamespace(geocode=unavailable_geocode)
+    )
+    with pytest.raises(GeopyError):
+        asyncio.run(map_utils._nominatim_geocode("Cafe", unavailable))
+    assert ("nominatim", "cafe") not in cache
+
+    not_found = map_utils._rate_limited_nominatim(
+        SimpleNamespace(geocode=not_found_geocode)
+    )
+    assert asyncio.run(map_utils._nominatim_geocode("Cafe", not_found)) is None
+    assert ("nominatim", "cafe") in cache
+
+
+def test_geocode_cache_can_be_disabled(monkeypatch):
+    """
+    Test that the environment variable bypasses the geocode cache.
+    """
+    monkeypatch.setenv(map_utils.GEOCODE_CACHE_DISABLE_ENV, "1")
+    queries = []
+
+    async def fake_geocode(query):
+        queries.append(query)
+        return None
+
+    for _ in range(2):
+        assert asyncio.run(map_utils._nominatim_geocode("Cafe", fake_geocode)) is None
+    assert queries == ["Cafe", "Cafe"]
+
+
+STRONG_TITLE_RESULT = {"geometry": {"location": {"lat": 1, "lng": 2}}}
+PARTIAL_TITLE_RESULT = {
+    "geometry": {"location": {"lat": 1, "lng": 2}},
+    "partial_match": True,
+}
+APPROXIMATE_TITLE_RESULT = {
+    "geometry": {"location": {"lat": 1, "lng": 2}, "location_type": "APPROXIMATE"}
+}
+STRONG_URL_RESULT = {"geometry": {"location": {"lat": 3, "lng": 4}}}
+WEAK_URL_RESULT = {
+    "geometry": {"location": {"lat": 3, "lng": 4}, "location_type": "APPROXIMATE"}
+}
+URL = "https://maps.google.com/?cid=1"
+
+
+@pytest.mark.parametrize(
+    "title_results, url_results, expected_queries, expected_lat",
+    [
+        ([STRONG_TITLE_RESULT], [STRONG_URL_RESULT], ["Cafe"], 1),
+        ([PARTIAL_TITLE_RESULT], [STRONG_URL_RESULT], ["Cafe", URL], 3),
+        ([APPROXIMATE_TITLE_RESULT], [STRONG_URL_RESULT], ["Cafe", URL], 3),
+        # A weak URL match doesn't replace a weak title match
+        ([PARTIAL_TITLE_RESULT], [WEAK_URL_RESULT], ["Cafe", URL], 1),
+        ([APPROXIMATE_TITLE_RESULT], [], ["Cafe", URL], 1),
+        # Without any title match, even a weak URL match is used
+        ([], [WEAK_URL_RESULT], ["Cafe", URL], 3),
+    ],
+)
+def test_geocode_row_queries_url_only_for_weak_matches(
+    monkeypatch, title_results, url_results, expected_queries, expected_lat
+):
+    """
+    Test that the URL is only geocoded, and its result only used, when the title match is missing or weak.
+    """
+    queries = []
+
+    async def fake_geocode_with_retry(query, *args):
+        queries.append(query)
+        return title_results if query == "Cafe" else url_results
+
+    monkeypatch.setattr(map_utils, "_geocode_with_retry", fake_geocode_with_retry)
+    row = {"Title": "Cafe", "URL": URL}
+    feature = asyncio.run(
+        map_utils._geocode_row(row, None, "fake-key", None, None, None, None)
+    )
+    assert queries == expected_queries
+    assert feature["geometry"]["coordinates"][1] == expected_lat
+
+
+def test_geocode_row_skips_nominatim_after_consecutive_failures(monkeypatch):
+    """
+    Test that Nominatim stops being called once the circuit breaker opens.
+    """
+    nominatim_calls = []
+
+    async def fake_geocode_with_retry(query, *args):
+        return []
+
+    async def failing_nominatim_geocode(query, geocode):
+        nominatim_calls.append(query)
+        raise GeopyError("Service unavailable")
+
+    async def fake_arcgis_geocode(query, geolocator):
+        return {"lat": 1.0, "lon": 2.0, "address": "Somewhere"}
+
+    monkeypatch.setattr(map_utils, "_geocode_with_retry", fake_geocode_with_retry)
+    monkeypatch.setattr(map_utils, "_nominatim_geocode", failing_nominatim_geocode)
+    monkeypatch.setattr(map_utils, "_arcgis_geocode", fake_arcgis_geocode)
+    breaker = map_utils._CircuitBreaker("Nominatim", max_failures=3)
+    for i in range(5):
+        row = {"Title": f"Place {i}", "URL": f"https://maps.google.com/?cid={i}"}
+        feature = asyncio.run(
+            map_utils._geocode_row(row, None, "fake-key", None, None, breaker, None)
+        )
+        assert feature["geometry"]["coordinates"] == [2.0, 1.0]
+    assert nominatim_calls == ["Place 0", "Place 1", "Place 2"]
+    assert breaker.is_open
+
+
+def test_geocode_places_async_reads_coordinate_titles_without_geocoding(
+    geocoded_titles,
+):
+    """
+    Test that DMS and decimal coordinate titles become features without any API call.
+    """
+    rows = [
+        {
+            "Title": "4°41'02.9\"N 74°02'54.5\"W",
+            "URL": "https://maps.google.com/?cid=1",
+        },
+        {"Title": "Cafe", "URL": "https://maps.google.com/?cid=2"},
+        {"Title": "-33.8568, 151.2153", "URL": "https://maps.google.com/?cid=3"},
+    ]
+    result = asyncio.run(geocode_places_async(rows, "fake-key", "test@example.com"))
+    assert geocoded_titles == ["Cafe"]
+    names = [feat["properties"]["location"]["name"] for feat in result["features"]]
+    assert names == [row["Title"] for row in rows]
+    dms_feature, _, decimal_feature = result["features"]
+    assert dms_feature["geometry"]["coordinates"] == pytest.approx(
+        [-74.048472, 4.684139]
+    )
+    assert dms_feature["properties"]["categories"] == []
+    assert decimal_feature["geometry"]["coordinates"] == [151.2153, -33.8568]
+
+
+def test_geocode_places_async_skips_out_of_range_coordinate_titles(
+    geocoded_titles,
+):
+    """
+    Test that coordinate titles out of range are skipped rather than geocoded.
+    """
+    rows = [
+        {
+            "Title": "95°41'02.9\"N 74°02'54.5\"W",
+            "URL": "https://maps.google.com/?cid=1",
+        },
+        {"Title": "12.5, 190.5", "URL": "https://maps.google.com/?cid=2"},
+        {"Title": "Cafe", "URL": "https://maps.google.com/?cid=3"},
+    ]
+    result = asyncio.run(geocode_places_async(rows, "fake-key", "test@example.com"))
+    assert geocoded_titles == ["Cafe"]
+    names = [feat["properties"]["location"]["name"] for feat in result["features"]]
+    assert names == ["Cafe"]
+
+
+@pytest.mark.parametrize(
+    "coord, expected",
+    [
+        ("4°41'02.9\"N 74°02'54.5\"W", (4.684139, -74.048472)),
+        ("04°41'02.90\" s, 074°02'54.50\" E", (-4.684139, 74.048472)),
+    ],
+)
+def test_parse_dms(coord, expected):
+    """
+    Test that DMS strings are converted to signed decimal degrees.
+    """
+    assert parse_dms(coord) == pytest.approx(expected)
+
+
+def test_parse_dms_invalid():
+    """
+    Test that a ValueError is raised for strings that aren't DMS coordinates.
+    """
+    with pytest.raises(ValueError):
+        parse_dms("Cafe Central")
+
+
+def test_geocode_row_breaker_opens_through_real_rate_limiter(
+    monkeypatch, no_geocode_delays
+):
+    """
+    Test that Nominatim outages reach the circuit breaker through the rate limiter.
+    """
+    geocode_calls = []
+
+    async def unavailable_geocode(query):
+        geocode_calls.append(query)
+        raise GeocoderUnavailable("Service unavailable")
+
+    async def fake_geocode_with_retry(query, *args):
+        return []
+
+    async def fake_arcgis_geocode(query, geolocator):
+        return {"lat": 1.0, "lon": 2.0, "address": "Somewhere"}
+
+    monkeypatch.setattr(map_utils, "_geocode_with_retry", fake_geocode_with_retry)
+    monkeypatch.setattr(map_utils, "_arcgis_geocode", fake_arcgis_geocode)
+    nominatim_geocode = map_utils._rate_limited_nominatim(
+        SimpleNamespace(geocode=unavailable_geocode)
+    )
+    breaker = map_utils._CircuitBreaker("Nominatim", max_failures=3)
+    for i in range(5):
+        row = {"Title": f"Place {i}", "URL": f"https://maps.google.com/?cid={i}"}
+        asyncio.run(
+            map_utils._geocode_row(
+                row, None, "fake-key", None, nominatim_geocode, breaker, None
+            )
+        )
+    assert breaker.is_open
+    assert set(geocode_calls) == {"Place 0", "Place 1", "Place 2"}
+
+
+def test_geocode_cache_opened_lazily_in_configured_dir(tmp_path, monkeypatch):
+    """
+    Test that the geocode cache is only opened when used, in the configured directory.
+    """
+    monkeypatch.setattr(map_utils, "_geocode_cache", None)
+    monkeypatch.setenv(map_utils.GEOCODE_CACHE_DISABLE_ENV, "1")
+    assert map_utils._get_cached_geocode("google", "Cafe") is map_utils._CACHE_MISS
+    assert map_utils._geocode_cache is None
+
+    cache_dir = tmp_path / "custom_geocode_cache"
+    monkeypatch.delenv(map_utils.GEOCODE_CACHE_DISABLE_ENV)
+    monkeypatch.setenv(map_utils.GEOCODE_CACHE_DIR_ENV, str(cache_dir))
+    map_utils._set_cached_geocode("google", "Cafe", [])
+    assert cache_dir.is_dir()
+    assert map_utils._get_cached_geocode("google", " cafe ") == []
+
+
+class FakeResponse:
+    """
+    Minimal stand-in for an aiohttp response used as an async context manager.
+    """
+
+    def __init__(self, url, params, status):
+        self.url = f"{url}?{urlencode(params)}"
+        self.status = status
+
+    def raise_for_status(self):
+        # Like aiohttp, mention the full request URL in the error
+        raise aiohttp.ClientResponseError(
+            SimpleNamespace(real_url=self.url), (), status=self.status
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+def test_geocode_row_never_logs_the_api_key(caplog, no_geocode_delays):
+    """
+    Test that Google Maps HTTP errors are logged without the request URL's API key.
+    """
+    api_key = "AIzaSECRET"
+    session = SimpleNamespace(get=lambda url, params: FakeResponse(url, params, 503))
+    logged_messages = []
+    sink_id = logger.add(logged_messages.append)
+    caplog.set_level(logging.INFO)
+    try:
+        row = {"Title": "Cafe", "URL": "https://maps.google.com/?cid=1"}
+        feature = asyncio.run(
+            map_utils._geocode_row(
+                row,
+                session,
+                api_key,
+                map_utils._RateLimiter(rps=1000),
+                None,
+                None,
+                None,
+            )
+        )
+    finally:
+        logger.remove(sink_id)
+    assert feature is None
+    assert all(api_key not in message for message in logged_messages)
+    assert api_key not in caplog.text
+    assert any("HTTP 503" in message for message in logged_messages)